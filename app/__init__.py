@@ -1,8 +1,5 @@
 import logging
 
-from app.config.settings import get_settings
-
-settings = get_settings()
 logger = logging.getLogger(__name__)
 
 
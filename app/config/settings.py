@@ -14,6 +14,8 @@ class Environment(Enum):
 class GoogleDriveSettings(BaseSettings):
     credentials_path: str = "keys/erudite-scholar-447111-m6-d346e2fd7c8f.json"
     default_upload_path: str = "/test/files"
+    # Uploads in flight at once when several files go to Drive together
+    max_upload_concurrency: int = 4
 
     class Config:
         env_prefix = "GOOGLE_DRIVE_"
@@ -25,6 +27,13 @@ class DatabaseSettings(BaseSettings):
     password: str = "postgres"
     host: str = "localhost"
     port: int = 5432
+    pool_size: int = 10
+    max_overflow: int = 20
+    # Recycling bounds connection age instead of pinging on every checkout
+    pool_recycle: int = 300
+    pool_pre_ping: bool = False
+    prepared_statement_cache_size: int = 256
+    query_cache_size: int = 500
 
     class Config:
         env_prefix = "POSTGRES_DB_"
@@ -45,6 +54,9 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     log_level: str = "debug"
     app_reload: bool = True
+    enable_docs: bool = False
+    # Cheap password hashes for test runs; never enable in a deployment
+    fast_password_hashing: bool = False
 
     ALLOWED_CORS_ORIGINS: set = [
         "http://localhost:5173",
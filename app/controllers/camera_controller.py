@@ -80,7 +80,7 @@ class CameraController:
         summary="Capture image from camera",
         description="Captures an image from an Aravis-compatible camera and returns it as a base64-encoded string",
     )
-    def capture_image(
+    async def capture_image(
         self,
         camera_id: Optional[str] = Query(
             None, description="Optional camera ID to use for capture"
@@ -99,8 +99,8 @@ class CameraController:
             )
             camera_service = AravisCameraService(camera_id=camera_id, logger=logger)
 
-            # Connect to camera
-            if not camera_service.connect():
+            # Connect to camera (blocking GObject calls, kept off the event loop)
+            if not await asyncio.to_thread(camera_service.connect):
                 return StreamingResponse(
                     io.BytesIO(b""),
                     media_type="application/json",
@@ -110,7 +110,10 @@ class CameraController:
             try:
                 # Get image as blob
                 format = "PNG"  # Default format
-                image_blob = camera_service.get_image_blob(format=format)
+                # Preview download: fast zlib level over the smallest file
+                image_blob = await camera_service.get_image_blob_async(
+                    format=format, compress_level=1
+                )
 
                 if not image_blob:
                     return StreamingResponse(
@@ -134,7 +137,7 @@ class CameraController:
                 )
             finally:
                 # Always disconnect from the camera when done
-                camera_service.disconnect()
+                await asyncio.to_thread(camera_service.disconnect)
 
         except Exception as e:
             logger.error(f"Image capture error: {str(e)}")
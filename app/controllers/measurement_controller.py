@@ -71,7 +71,7 @@ class MeasurementController:
         self.measurement_service = MeasurementService()
         self.settings_service = SettingsService()
         self.scheduler = CronScheduler.get_instance()
-        self.google_drive_service = GoogleDriveService()
+        self.google_drive_service = GoogleDriveService.get_instance()
 
         # Register the measurement job with the scheduler
         self.scheduler.register_job(self.start_measurement_logic)
@@ -246,8 +246,8 @@ class MeasurementController:
                 f"Starting download of all files for Measurement ID: {measurement_id}"
             )
 
-            # Get measurement to verify it exists
-            measurement = await self.measurement_service.get_measurement(measurement_id)
+            # Get measurement to verify it exists, together with its files
+            measurement = await self.measurement_service.get_measurement_with_files(measurement_id)
             if not measurement:
                 return JSONResponse(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -257,8 +257,8 @@ class MeasurementController:
                     },
                 )
 
-            # Get all files for this measurement
-            files = await self.measurement_service.get_measurement_files(measurement_id)
+            # All files for this measurement, loaded with it
+            files = measurement.files
             if not files:
                 return JSONResponse(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -269,7 +269,7 @@ class MeasurementController:
                 )
 
             # Authenticate with Google Drive
-            if not self.google_drive_service.ensure_authenticated():
+            if not await self.google_drive_service.ensure_authenticated_async():
                 logger.error("Failed to authenticate with Google Drive")
                 return JSONResponse(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -286,7 +286,7 @@ class MeasurementController:
                 for file in files:
                     try:
                         # Download file content from Google Drive
-                        file_content = self.google_drive_service.download_file(file.google_drive_file_id)
+                        file_content = await self.google_drive_service.download_file_async(file.google_drive_file_id)
                         if file_content:
                             # Add to ZIP archive
                             zip_file.writestr(file.name, file_content)
@@ -392,7 +392,8 @@ class MeasurementController:
                 # Use our new comprehensive method that handles cameras and files
                 measurement = await self.measurement_service.start_measurement_by_config(config)
                 if measurement:
-                    schema = MeasurementInfoSchema.from_orm(measurement)
+                    # Already a MeasurementInfoSchema; no need to validate it a second time
+                    schema = measurement
                     if hasattr(measurement, 'files') and measurement.files:
                         schema.files = []
                         for file in measurement.files:
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from fastapi_restful.cbv import cbv
 import logging
 from pydantic import BaseModel
@@ -40,14 +41,15 @@ class SettingsController:
     )
     async def get_measurement_config(
         self, current_user: TokenPayloadSchema = Depends(get_current_user)
-    ) -> MeasurementConfigSchema:
+    ) -> ORJSONResponse:
         """
         Get the current measurement configuration.
 
         Returns all settings related to the measurement process including frequencies,
         camera options, and sensor configurations.
         """
-        return await self.settings_service.get_measurement_config()
+        # The cached dict is already in response shape, so skip response_model re-validation
+        return ORJSONResponse(await self.settings_service.get_measurement_config_dict())
 
     @settings_router.put(
         "/measurement-config",
@@ -1,5 +1,5 @@
 from datetime import datetime
-from fastapi import status, APIRouter, Depends
+from fastapi import status, APIRouter, Depends, Request
 from fastapi.responses import JSONResponse
 from fastapi_restful.cbv import cbv
 from pydantic import BaseModel
@@ -9,7 +9,7 @@ from app.services.cron_scheduler import CronScheduler
 from app.services.measurement_service import MeasurementService
 from app.services.settings_service import SettingsService
 from app.models.measurement import MeasurementInfoSchema
-from app.controllers.user_controller import get_current_user
+from app.middleware.auth import get_current_user
 from app.models.user import TokenPayloadSchema
 
 system_router = APIRouter(
@@ -42,7 +42,7 @@ class SystemController:
     @system_router.get(
         "/", 
         include_in_schema=False,
-        response_model=WelcomeResponse
+        response_model=None
     )
     async def root(self) -> WelcomeResponse:
         """Display welcome message."""
@@ -51,7 +51,7 @@ class SystemController:
     @system_router.get(
         "/health", 
         include_in_schema=False,
-        response_model=HealthCheckResponse
+        response_model=None
     )
     async def healthcheck(self) -> JSONResponse:
         """Health check endpoint for monitoring and load balancers."""
@@ -61,6 +61,28 @@ class SystemController:
             code=status.HTTP_200_OK
         )
         return JSONResponse(data.dict(), status_code=status.HTTP_200_OK)
+
+    @system_router.get(
+        "/health/live",
+        include_in_schema=False,
+        response_model=None
+    )
+    async def liveness(self) -> JSONResponse:
+        """Liveness probe, answers as soon as the socket is bound."""
+        return JSONResponse({"ok": True}, status_code=status.HTTP_200_OK)
+
+    @system_router.get(
+        "/health/ready",
+        include_in_schema=False,
+        response_model=None
+    )
+    async def readiness(self, request: Request) -> JSONResponse:
+        """Readiness probe, answers 503 until startup initialization has finished."""
+        if getattr(request.app.state, "ready", False):
+            return JSONResponse({"ready": True}, status_code=status.HTTP_200_OK)
+        return JSONResponse(
+            {"ready": False}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
         
     @system_router.get(
         "/scheduler/status", 
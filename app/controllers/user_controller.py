@@ -2,7 +2,7 @@ import logging
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from fastapi.security import OAuth2PasswordRequestForm
 from fastapi_restful.cbv import cbv
 from pydantic import BaseModel
 
@@ -29,9 +29,6 @@ user_router = APIRouter(
     prefix="/users", tags=["users"], responses={404: {"description": "Not found"}}
 )
 
-# Set up OAuth2 with Password Flow
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/users/login")
-
 
 class UserListResponse(BaseModel):
     users: List[UserResponseSchema]
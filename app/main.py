@@ -1,31 +1,64 @@
-import psycopg2
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from httpx import HTTPError
 from pydantic import ValidationError
 from sqlalchemy.exc import IntegrityError, NoResultFound, ProgrammingError
 from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from uvicorn.config import LOG_LEVELS
 
 from app.config import exception_config as exh
-from app.config.settings import Environment, get_database_settings, get_settings
-from app.controllers.camera_controller import camera_router
-from app.controllers.measurement_controller import measurement_router
-from app.controllers.settings_controller import settings_router
-from app.controllers.system_controller import system_router
-from app.controllers.user_controller import user_router
-from app.services.cron_scheduler import CronScheduler
-from app.services.settings_service import SettingsService
-from app.utils import db_session
-from app.services.measurement_service import MeasurementService
+from app.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Back-off between database warm-up attempts at startup, doubling up to the maximum
+DB_WARMUP_INITIAL_DELAY = 1
+DB_WARMUP_MAX_DELAY = 30
 
-settings = get_settings()
+
+def configure_logging(log_level: str) -> None:
+    """Send the application's loggers to stderr at the given log level"""
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(LOG_LEVELS[log_level])
+    if not app_logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(levelname)s:     %(name)s - %(message)s"))
+        app_logger.addHandler(handler)
 
 
 def create_application() -> FastAPI:
+    # Controllers pull in the camera, Drive and ORM stacks, so they are only
+    # imported once an application is actually built
+    from app.controllers.camera_controller import camera_router
+    from app.controllers.measurement_controller import measurement_router
+    from app.controllers.settings_controller import settings_router
+    from app.controllers.system_controller import system_router
+    from app.controllers.user_controller import user_router
+    from app.middleware.auth import JWTAuthMiddleware
+
+    # Settings are resolved per build rather than at import, so env overrides
+    # applied before create_application() are picked up
+    settings = get_settings()
+    configure_logging(settings.log_level)
+
+    # OpenAPI schema and docs UIs are only built when ENABLE_DOCS is set
     application = FastAPI(
         title="Fast Api Docker Poetry Docs",
         debug=False,
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+        openapi_url="/openapi.json" if settings.enable_docs else None,
+        docs_url="/docs" if settings.enable_docs else None,
+        redoc_url="/redoc" if settings.enable_docs else None,
     )
 
     # Configure CORS
@@ -37,8 +70,8 @@ def create_application() -> FastAPI:
         allow_headers=["*"],
     )
 
-    if settings.environment == Environment.prod:
-        application.openapi_url = None
+    # Resolve bearer tokens once per request for get_current_user
+    application.add_middleware(JWTAuthMiddleware)
 
     application.add_exception_handler(
         RequestValidationError, exh.req_validation_handler
@@ -59,41 +92,72 @@ def create_application() -> FastAPI:
     application.include_router(settings_router, prefix="/api")
     application.include_router(camera_router, prefix="/api")
 
-    # Add catch-all routes for unknown endpoints with unique operation IDs
-    @application.get("/{path_name:path}", operation_id="catch_all_get")
-    @application.post("/{path_name:path}", operation_id="catch_all_post")
-    @application.put("/{path_name:path}", operation_id="catch_all_put")
-    @application.delete("/{path_name:path}", operation_id="catch_all_delete")
-    @application.patch("/{path_name:path}", operation_id="catch_all_patch")
-    @application.head("/{path_name:path}", operation_id="catch_all_head")
-    @application.options("/{path_name:path}", operation_id="catch_all_options")
-    async def catch_all(path_name: str):
-        """Handle all unknown routes"""
-        return {"detail": f"Endpoint '/{path_name}' not found", "status_code": 404}
-
-    @application.on_event("startup")
-    async def initialize():
-        print("Connecting to postgres...")
-        dsn = get_database_settings().url
-        conn = psycopg2.connect(dsn)
-        cur = conn.cursor()
-        cur.execute("SELECT 1;")
-        cur.close()
-        conn.close()
-        print("Successfully connected to postgres...")
-
-        # Set up the scheduler based on the configuration
-        await initialize_scheduler()
-
-    @application.on_event("shutdown")
-    async def shutdown():
-        await db_session.shutdown()
+    # Register a single plain Starlette route as the catch-all for unknown endpoints.
+    # It must stay last so it never shadows the API routes.
+    application.router.routes.append(
+        Route(
+            "/{path_name:path}",
+            catch_all,
+            methods=["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"],
+            include_in_schema=False,
+        )
+    )
 
     return application
 
 
+async def catch_all(request: Request) -> JSONResponse:
+    """Handle all unknown routes"""
+    path_name = request.path_params["path_name"]
+    return JSONResponse(
+        {"detail": f"Endpoint '/{path_name}' not found", "status_code": 404}
+    )
+
+
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    """
+    Start serving right away and finish the heavy initialization in the background.
+    /api/health/ready answers 503 until application.state.ready is set.
+    """
+    from app.utils import db_session
+
+    application.state.ready = False
+    init_task = asyncio.create_task(initialize(application))
+    yield
+    init_task.cancel()
+    await db_session.shutdown()
+
+
+async def initialize(application: FastAPI):
+    """
+    Connect to the database and set up the scheduler, then mark the app ready.
+    The connection is retried with back-off until it succeeds or the app shuts down.
+    """
+    from app.utils import db_session
+
+    delay = DB_WARMUP_INITIAL_DELAY
+    while True:
+        try:
+            logger.info("Connecting to postgres...")
+            await db_session.warm_connection_pool()
+            logger.info("Successfully connected to postgres...")
+            break
+        except Exception as e:
+            logger.error(f"Error connecting to postgres: {str(e)}, retrying in {delay}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, DB_WARMUP_MAX_DELAY)
+
+    # Set up the scheduler based on the configuration
+    await initialize_scheduler()
+    application.state.ready = True
+
+
 async def initialize_scheduler():
     """Initialize the measurement scheduler based on the database configuration"""
+    from app.services.cron_scheduler import CronScheduler
+    from app.services.measurement_service import MeasurementService
+    from app.services.settings_service import SettingsService
 
     try:
         # Get the current configuration from the database
@@ -106,25 +170,29 @@ async def initialize_scheduler():
         # Initialize services in the scheduler
         scheduler.measurement_service = MeasurementService()
         scheduler.settings_service = settings_service
+        scheduler.cache_config(config)
         
         # Set up the schedule
         scheduler.set_new_schedule(
             config.measurement_frequency, config.first_measurement, config.id
         )
+        # Nothing to coalesce with at startup, start the schedule task now
+        scheduler.apply_pending_schedule()
 
-        print(
+        logger.info(
             f"Scheduler initialized with frequency: {config.measurement_frequency} minutes RGB: {config.rgb_camera} Multispectral: {config.multispectral_camera}"
         )
-        print(
+        logger.info(
             f"First measurement scheduled for: {config.first_measurement.isoformat()}"
         )
     except Exception as e:
-        print(f"Error initializing scheduler: {str(e)}")
+        logger.error(f"Error initializing scheduler: {str(e)}")
 
 
 if __name__ == "__main__":
     import uvicorn
 
+    settings = get_settings()
     uvicorn.run(
         "app.main:create_application",
         factory=True,
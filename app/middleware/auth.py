@@ -1,15 +1,15 @@
 import os
-from datetime import datetime, timedelta
-from typing import Any, Dict
-
-from fastapi import Depends, HTTPException
-from fastapi.security import (
-    HTTPAuthorizationCredentials,
-    HTTPBearer,
-    OAuth2PasswordBearer,
-)
-from jose import JWTError, jwt
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError, jwk, jwt
+from pydantic import ValidationError
 from starlette import status
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.models.user import TokenPayloadSchema, UserOrm
 
@@ -21,34 +21,103 @@ REFRESH_TOKEN_SECRET = os.getenv(
     "REFRESH_TOKEN_SECRET", "refresh_secret_key_for_development"
 )
 
-# Set up Bearer token scheme
-security = HTTPBearer()
+JWT_ALGORITHM = "HS256"
+ACCESS_TOKEN_LIFETIME = 30 * 60  # 30 minutes, in seconds
+REFRESH_TOKEN_LIFETIME = 90 * 24 * 60 * 60  # 90 days, in seconds
+
+# HMAC keys are built once instead of on every encode/decode call
+_ACCESS_KEY = jwk.construct(ACCESS_TOKEN_SECRET, JWT_ALGORITHM)
+_REFRESH_KEY = jwk.construct(REFRESH_TOKEN_SECRET, JWT_ALGORITHM)
+
 
-# OAuth2 scheme for Swagger UI integration
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/users/login")
+# Declares the bearer scheme in the OpenAPI schema (Swagger "Authorize") and answers 403
+# when no bearer credentials are sent; the token itself is resolved by JWTAuthMiddleware
+bearer_scheme = HTTPBearer()
 
+# Raw ASGI header name and auth scheme, compared as bytes without building a header dict
+_AUTHORIZATION_HEADER = b"authorization"
+_BEARER_SCHEME = b"bearer"
 
-async def get_token_from_authorization(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-) -> str:
-    return credentials.credentials
+# Decoded access tokens keyed by the raw token: token -> (payload, valid until)
+TOKEN_CACHE_SIZE = 4096
+TOKEN_CACHE_TTL = 60  # seconds
+_token_cache: "OrderedDict[str, Tuple[TokenPayloadSchema, float]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
+def _authenticate(token: str) -> Optional[TokenPayloadSchema]:
+    """
+    Return the token payload, or None if the token is invalid or expired
+    """
+    now = time.time()
+    with _token_cache_lock:
+        cached = _token_cache.get(token)
+    if cached is not None:
+        user, valid_until = cached
+        if valid_until > now:
+            return user
+        with _token_cache_lock:
+            _token_cache.pop(token, None)
+
+    try:
+        payload = jwt.decode(token, _ACCESS_KEY, algorithms=[JWT_ALGORITHM])
+        user = TokenPayloadSchema(**payload)
+    except (JWTError, ValidationError):
+        return None
+
+    # Never serve a cached payload past the token's own expiration
+    valid_until = min(payload.get("exp", now), now + TOKEN_CACHE_TTL)
+    with _token_cache_lock:
+        _token_cache[token] = (user, valid_until)
+        if len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    return user
+
+
+class JWTAuthMiddleware:
+    """
+    Pure ASGI middleware that resolves the bearer token once per request.
+
+    The decoded payload (or None) is stored in scope["state"]["user"]; it never
+    rejects a request itself, that is left to the get_current_user dependency.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        user = None
+        for name, value in scope["headers"]:
+            if name == _AUTHORIZATION_HEADER:
+                scheme, _, credentials = value.partition(b" ")
+                if scheme.lower() == _BEARER_SCHEME and credentials:
+                    user = _authenticate(credentials.decode("latin-1"))
+                break
+
+        scope.setdefault("state", {})["user"] = user
+        await self.app(scope, receive, send)
 
 
 async def get_current_user(
-    token: str = Depends(get_token_from_authorization),
+    request: Request,
+    _credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
 ) -> TokenPayloadSchema:
     """
-    Validate JWT token and extract user information
+    Return the user resolved by JWTAuthMiddleware or reject the request: 403 without
+    bearer credentials, 401 for an invalid or expired token
     """
-    try:
-        payload = jwt.decode(token, ACCESS_TOKEN_SECRET, algorithms=["HS256"])
-        return TokenPayloadSchema(**payload)
-    except JWTError:
+    user = request.scope.get("state", {}).get("user")
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    return user
 
 
 def generate_access_token(user: UserOrm) -> str:
@@ -64,10 +133,10 @@ def generate_access_token(user: UserOrm) -> str:
         "user_name": user.user_name,
         "first_name": user.first_name,
         "last_name": user.last_name,
-        "exp": datetime.utcnow() + timedelta(minutes=30),  # 30 minutes expiration
+        "exp": int(time.time()) + ACCESS_TOKEN_LIFETIME,
     }
 
-    return jwt.encode(payload, ACCESS_TOKEN_SECRET, algorithm="HS256")
+    return jwt.encode(payload, _ACCESS_KEY, algorithm=JWT_ALGORITHM)
 
 
 def generate_refresh_token(user_id: int) -> str:
@@ -79,10 +148,10 @@ def generate_refresh_token(user_id: int) -> str:
 
     payload = {
         "id": user_id,
-        "exp": datetime.utcnow() + timedelta(days=90),  # 90 days expiration
+        "exp": int(time.time()) + REFRESH_TOKEN_LIFETIME,
     }
 
-    return jwt.encode(payload, REFRESH_TOKEN_SECRET, algorithm="HS256")
+    return jwt.encode(payload, _REFRESH_KEY, algorithm=JWT_ALGORITHM)
 
 
 def verify_refresh_token(token: str) -> Dict[str, Any]:
@@ -90,7 +159,7 @@ def verify_refresh_token(token: str) -> Dict[str, Any]:
     Verify a refresh token and return its payload
     """
     try:
-        payload = jwt.decode(token, REFRESH_TOKEN_SECRET, algorithms=["HS256"])
+        payload = jwt.decode(token, _REFRESH_KEY, algorithms=[JWT_ALGORITHM])
         return payload
     except JWTError:
         raise HTTPException(
@@ -29,6 +29,10 @@ class BaseOrm(Base):
 
     __abstract__ = True
     __table_args__ = {"extend_existing": True}
+    # flush() reads server-generated columns (id, timestamps) back with INSERT ... RETURNING,
+    # so repositories never refresh() a new row; under AsyncSession that refresh would be
+    # an implicit lazy load outside the greenlet
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(BigInteger, primary_key=True, autoincrement=True, nullable=False)
     created_at = Column(
@@ -1,5 +1,8 @@
 import uuid
+from datetime import datetime
+from typing import Optional
 
+from pydantic import BaseModel
 from sqlalchemy import (
     Boolean,
     Column,
@@ -9,6 +12,7 @@ from sqlalchemy import (
     Integer,
     String,
 )
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -20,7 +24,8 @@ class CameraFile(Base):
 
     __tablename__ = "camera_files"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    # Native 16-byte UUID instead of its 36-character text form
+    id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     file_name = Column(String(255), nullable=False)
     file_path = Column(String(512), nullable=False)
     file_size = Column(Integer, nullable=True)
@@ -44,7 +49,7 @@ class CameraFile(Base):
     wavelength = Column(Integer, nullable=True)  # For multispectral images
 
     # For multispectral sets, link related files
-    parent_id = Column(String(36), ForeignKey("camera_files.id"), nullable=True)
+    parent_id = Column(PG_UUID(as_uuid=True), ForeignKey("camera_files.id"), nullable=True)
 
     # File status
     is_uploaded = Column(Boolean, default=False)
@@ -59,5 +64,27 @@ class CameraFile(Base):
         "CameraFile", backref="parent", remote_side=[id], cascade="all, delete-orphan"
     )
 
+    # Not a BaseOrm subclass, so it doesn't inherit eager_defaults
+    __mapper_args__ = {"eager_defaults": True}
+
     def __repr__(self):
         return f"<CameraFile {self.id}: {self.file_name}>"
+
+
+class CameraFileListItemSchema(BaseModel):
+    """
+    Camera file fields returned by list/search endpoints, built straight from result rows
+    """
+
+    id: uuid.UUID
+    file_name: str
+    file_path: str
+    file_size: Optional[int] = None
+    mime_type: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    camera_id: Optional[str] = None
+    wavelength: Optional[int] = None
+    is_uploaded: Optional[bool] = None
+    cloud_url: Optional[str] = None
+    created_at: Optional[datetime] = None
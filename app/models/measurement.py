@@ -16,7 +16,8 @@ class MeasurementInfoOrm(BaseOrm):
     """
     __tablename__ = "measurement_info"
 
-    date_time = Column(DateTime(timezone=True), nullable=False)
+    # Indexed for the latest/history queries that order and filter on it
+    date_time = Column(DateTime(timezone=True), nullable=False, index=True)
     rgb_camera = Column(Boolean, default=False, nullable=False)
     multispectral_camera = Column(Boolean, default=False, nullable=False)
     number_of_sensors = Column(Integer, nullable=False)
@@ -24,7 +25,9 @@ class MeasurementInfoOrm(BaseOrm):
     scheduled = Column(Boolean, default=False, nullable=False)
     
     # Relationship to measurement files
-    files: Mapped[List["MeasurementFileOrm"]] = relationship(lazy="selectin")
+    files: Mapped[List["MeasurementFileOrm"]] = relationship(
+        lazy="selectin", order_by="MeasurementFileOrm.id"
+    )
 
 
 class MeasurementConfigOrm(BaseOrm):
@@ -16,7 +16,9 @@ class MeasurementFileOrm(BaseOrm):
 
     name = Column(String, nullable=False)
     google_drive_file_id = Column(String, nullable=False)
-    measurement_id = Column(Integer, ForeignKey("measurement_info.id"), nullable=False)
+    measurement_id = Column(
+        Integer, ForeignKey("measurement_info.id"), nullable=False, index=True
+    )
     
     # Relationship to the measurement - Using modern Mapped pattern
     measurement: Mapped["MeasurementInfoOrm"] = relationship(back_populates="files")
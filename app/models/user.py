@@ -1,13 +1,36 @@
+from functools import lru_cache
 from typing import Optional
 
 from passlib.context import CryptContext
 from pydantic import BaseModel, validator
 from sqlalchemy import Boolean, Column, String, Text
 
+from app.config.settings import get_settings
 from app.models.base import BaseOrm, BaseSchema
 
-# Set up password context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+@lru_cache(maxsize=1)
+def get_pwd_context() -> CryptContext:
+    """
+    Password context; new hashes use argon2id, existing bcrypt hashes still verify.
+    Built on first use so importing the models doesn't probe the hash backends.
+    With fast_password_hashing set (tests) argon2 uses its minimum cost instead.
+    """
+    if get_settings().fast_password_hashing:
+        return CryptContext(
+            schemes=["argon2", "bcrypt"],
+            deprecated="auto",
+            argon2__time_cost=1,
+            argon2__memory_cost=8,
+            argon2__parallelism=1,
+            bcrypt__rounds=4,
+        )
+    return CryptContext(
+        schemes=["argon2", "bcrypt"],
+        deprecated="auto",
+        argon2__time_cost=2,
+        argon2__memory_cost=19456,
+        argon2__parallelism=1,
+    )
 
 
 class UserOrm(BaseOrm):
@@ -28,7 +51,7 @@ class UserOrm(BaseOrm):
         """
         Validates a password against the user's stored hash
         """
-        return pwd_context.verify(password, self.password)
+        return get_pwd_context().verify(password, self.password)
 
 
 class UserCreateSchema(BaseSchema):
@@ -1,5 +1,8 @@
+from typing import Optional
+
 from sqlalchemy import select, delete, func
 from sqlalchemy.exc import NoResultFound
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.base import BaseOrm
 from app.models.pageable import PageRequestSchema
@@ -12,19 +15,19 @@ class BaseRepository:
     def __init__(self, model: BaseOrm):
         self.__model__ = model
 
-    async def save(self, data):
-        async with get_db_session() as session:
+    async def save(self, data, session: Optional[AsyncSession] = None):
+        async with get_db_session(session) as session:
             session.add(data)
             await session.flush()  # Ensure the object has an ID
             await session.refresh(data)
             return data
 
-    async def delete(self, data):
-        async with get_db_session() as session:
+    async def delete(self, data, session: Optional[AsyncSession] = None):
+        async with get_db_session(session) as session:
             await session.delete(data)
 
-    async def get_by_id(self, id, *args):
-        async with get_db_session() as session:
+    async def get_by_id(self, id, *args, session: Optional[AsyncSession] = None):
+        async with get_db_session(session) as session:
             try:
                 execute = await session.execute(select(self.__model__).filter_by(id=id))
                 return execute.scalars().first()
@@ -33,12 +36,12 @@ class BaseRepository:
                     return args[0]
                 raise e
 
-    async def delete_by_id(self, entity_id: int):
-        async with get_db_session() as session:
+    async def delete_by_id(self, entity_id: int, session: Optional[AsyncSession] = None):
+        async with get_db_session(session) as session:
             await session.execute(delete(self.__model__).filter_by(id=entity_id))
 
-    async def get_by_ids(self, ids, *args):
-        async with get_db_session() as session:
+    async def get_by_ids(self, ids, *args, session: Optional[AsyncSession] = None):
+        async with get_db_session(session) as session:
             try:
                 result = await session.execute(select(self.__model__).filter(self.__model__.id.in_(ids)))
                 return result.scalars().all()
@@ -47,8 +50,9 @@ class BaseRepository:
                     return args[0]
                 raise e
 
-    async def get_paged_items(self, pageable: PageRequestSchema, params: dict):
-        async with get_db_session() as session:
+    async def get_paged_items(self, pageable: PageRequestSchema, params: dict,
+                              session: Optional[AsyncSession] = None):
+        async with get_db_session(session) as session:
             data = []
             execute = await session.execute(select(func.count()).select_from(self.__model__).filter_by(**params))
             total_count = execute.scalar()
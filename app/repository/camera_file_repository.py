@@ -1,9 +1,22 @@
-from typing import List, Optional, Dict, Any, Union
-from sqlalchemy import func, or_, desc, asc, select
-from ..models.camera_file import CameraFile
+from collections import defaultdict
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Tuple, Union
+from uuid import UUID
+from sqlalchemy import func, or_, desc, asc, delete, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+from ..models.camera_file import CameraFile, CameraFileListItemSchema
 from .base_repository import BaseRepository
 from app.utils.db_session import get_db_session
 
+# Callers only read column attributes; make any accidental lazy load of the
+# parent/children relationships fail loudly instead of emitting a query
+_NO_RELATIONSHIPS = raiseload("*")
+
+# Columns selected for search results; rows skip ORM hydration entirely
+_LIST_ITEM_FIELDS = tuple(CameraFileListItemSchema.__fields__)
+_LIST_ITEM_COLUMNS = [getattr(CameraFile, field) for field in _LIST_ITEM_FIELDS]
+
 
 class CameraFileRepository(BaseRepository):
     """Repository for managing camera file records in the database."""
@@ -11,113 +24,185 @@ class CameraFileRepository(BaseRepository):
     def __init__(self):
         super().__init__(CameraFile)
     
-    async def create_camera_file(self, file_data: Dict[str, Any]) -> CameraFile:
+    async def create_camera_file(self, file_data: Dict[str, Any], session: Optional[AsyncSession] = None) -> CameraFile:
         """
         Create a new camera file record.
         
         Args:
             file_data: Dictionary containing camera file data
+            session: Optional session to reuse instead of opening a new one
             
         Returns:
             Created CameraFile instance
         """
-        async with get_db_session() as session:
+        async with get_db_session(session) as session:
             camera_file = CameraFile(**file_data)
             session.add(camera_file)
-            await session.flush()  # Ensure the object has an ID
-            await session.refresh(camera_file)
+            await session.flush()
             return camera_file
     
-    async def create_multispectral_set(self, parent_data: Dict[str, Any], children_data: List[Dict[str, Any]]) -> CameraFile:
+    async def create_multispectral_set(
+        self,
+        parent_data: Dict[str, Any],
+        children_data: List[Dict[str, Any]],
+        session: Optional[AsyncSession] = None
+    ) -> CameraFile:
         """
         Create a multispectral image set with parent and child images.
         
         Args:
             parent_data: Dictionary containing parent file data
             children_data: List of dictionaries containing child file data
+            session: Optional session to reuse instead of opening a new one
             
         Returns:
             Parent CameraFile instance
         """
-        async with get_db_session() as session:
+        async with get_db_session(session) as session:
             # Create parent record
             parent = CameraFile(**parent_data)
             session.add(parent)
             await session.flush()  # Flush to get parent ID without committing
             
-            # Create children records with parent ID
-            for child_data in children_data:
-                child_data["parent_id"] = parent.id
-                child = CameraFile(**child_data)
-                session.add(child)
+            # Insert all children with a single batched INSERT
+            if children_data:
+                await session.execute(
+                    insert(CameraFile),
+                    [{**child_data, "parent_id": parent.id} for child_data in children_data],
+                )
             
             # Commit happens automatically when context manager exits
-            await session.refresh(parent)
             return parent
     
-    async def get_by_id(self, file_id: str) -> Optional[CameraFile]:
+    async def get_by_id(self, file_id: UUID, session: Optional[AsyncSession] = None) -> Optional[CameraFile]:
         """
         Get a camera file record by ID.
         
         Args:
             file_id: ID of the camera file
+            session: Optional session to reuse instead of opening a new one
             
         Returns:
             CameraFile instance if found, None otherwise
         """
-        async with get_db_session() as session:
-            result = await session.execute(select(CameraFile).filter(CameraFile.id == file_id))
+        async with get_db_session(session) as session:
+            result = await session.execute(
+                select(CameraFile).options(_NO_RELATIONSHIPS).filter(CameraFile.id == file_id)
+            )
             return result.scalars().first()
     
-    async def get_by_camera_id(self, camera_id: str, skip: int = 0, limit: int = 100) -> List[CameraFile]:
+    async def get_by_camera_id(
+        self,
+        camera_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[Tuple[datetime, UUID]] = None,
+        session: Optional[AsyncSession] = None
+    ) -> List[CameraFile]:
         """
         Get camera file records by camera ID.
         
         Args:
             camera_id: Camera ID
-            skip: Number of records to skip (for pagination)
+            skip: Number of records to skip (for pagination, ignored when cursor is given)
             limit: Maximum number of records to return
+            cursor: Optional (created_at, id) of the last record of the previous page
+            session: Optional session to reuse instead of opening a new one
             
         Returns:
-            List of CameraFile instances
+            List of CameraFile instances; the last item's (created_at, id) is the next cursor
         """
-        async with get_db_session() as session:
-            result = await session.execute(
+        async with get_db_session(session) as session:
+            query = (
                 select(CameraFile)
+                .options(_NO_RELATIONSHIPS)
                 .filter(CameraFile.camera_id == camera_id)
-                .order_by(desc(CameraFile.created_at))
-                .offset(skip)
+                .order_by(desc(CameraFile.created_at), desc(CameraFile.id))
                 .limit(limit)
             )
+            if cursor is not None:
+                query = query.where(tuple_(CameraFile.created_at, CameraFile.id) < tuple_(*cursor))
+            else:
+                query = query.offset(skip)
+            result = await session.execute(query)
             return result.scalars().all()
     
-    async def get_multispectral_set(self, parent_id: str) -> Dict[str, Any]:
+    async def get_multispectral_set(self, parent_id: UUID, session: Optional[AsyncSession] = None) -> Dict[str, Any]:
         """
         Get a multispectral image set by parent ID.
         
         Args:
             parent_id: ID of the parent file
+            session: Optional session to reuse instead of opening a new one
             
         Returns:
             Dictionary containing parent and children files
         """
-        async with get_db_session() as session:
-            parent = await self.get_by_id(parent_id)
-            if not parent:
-                return None
-                
+        async with get_db_session(session) as session:
+            # Parent and children in one round trip, split in Python
             result = await session.execute(
                 select(CameraFile)
-                .filter(CameraFile.parent_id == parent_id)
+                .options(_NO_RELATIONSHIPS)
+                .where(or_(CameraFile.id == parent_id, CameraFile.parent_id == parent_id))
                 .order_by(asc(CameraFile.wavelength))
             )
-            children = result.scalars().all()
+            rows = result.scalars().all()
+            
+            parent = next((row for row in rows if row.id == parent_id), None)
+            if not parent:
+                return None
+            children = [row for row in rows if row.parent_id == parent_id]
             
             return {
                 "parent": parent,
                 "children": children
             }
     
+    async def get_multispectral_sets_bulk(
+        self,
+        parent_ids: List[UUID],
+        session: Optional[AsyncSession] = None
+    ) -> Dict[UUID, Dict[str, Any]]:
+        """
+        Get several multispectral image sets with a single query.
+        
+        Args:
+            parent_ids: IDs of the parent files
+            session: Optional session to reuse instead of opening a new one
+            
+        Returns:
+            Dictionary mapping each found parent ID to its parent and children files
+        """
+        if not parent_ids:
+            return {}
+            
+        async with get_db_session(session) as session:
+            result = await session.execute(
+                select(CameraFile)
+                .options(_NO_RELATIONSHIPS)
+                .where(or_(CameraFile.id.in_(parent_ids), CameraFile.parent_id.in_(parent_ids)))
+                .order_by(asc(CameraFile.wavelength))
+            )
+            rows = result.scalars().all()
+            
+        # Bucket parents and children in a single pass
+        parents = {}
+        children = defaultdict(list)
+        for row in rows:
+            if row.parent_id is None:
+                parents[row.id] = row
+            else:
+                children[row.parent_id].append(row)
+                
+        return {
+            parent_id: {
+                "parent": parents[parent_id],
+                "children": children[parent_id]
+            }
+            for parent_id in parent_ids
+            if parent_id in parents
+        }
+    
     async def search_files(
         self, 
         search_term: Optional[str] = None,
@@ -129,7 +214,9 @@ class CameraFileRepository(BaseRepository):
         skip: int = 0, 
         limit: int = 100,
         sort_by: str = "created_at",
-        sort_desc: bool = True
+        sort_desc: bool = True,
+        cursor: Optional[Tuple[datetime, UUID]] = None,
+        session: Optional[AsyncSession] = None
     ) -> Dict[str, Any]:
         """
         Search for camera files with various filters.
@@ -145,16 +232,19 @@ class CameraFileRepository(BaseRepository):
             limit: Maximum number of records to return
             sort_by: Field to sort by
             sort_desc: Whether to sort in descending order
+            cursor: Optional (created_at, id) of the last item of the previous page.
+                Replaces OFFSET when sorting by created_at; ignored otherwise
+            session: Optional session to reuse instead of opening a new one
             
         Returns:
-            Dictionary with items and total count
+            Dictionary with CameraFileListItemSchema items, total count and the next_cursor for keyset paging
         """
-        async with get_db_session() as session:
-            # Build the base query
-            query = select(CameraFile)
+        async with get_db_session(session) as session:
+            # Only include parent files or files without a parent; listed first to
+            # match the partial index predicate
+            conditions = [CameraFile.parent_id == None]
             
             # Apply filters
-            conditions = []
             if search_term:
                 conditions.append(CameraFile.file_name.ilike(f"%{search_term}%"))
                 
@@ -173,41 +263,63 @@ class CameraFileRepository(BaseRepository):
             if end_date:
                 conditions.append(CameraFile.created_at <= end_date)
             
-            # Only include parent files or files without a parent
-            conditions.append(CameraFile.parent_id == None)
-            
-            # Apply all conditions to the query
-            for condition in conditions:
-                query = query.where(condition)
-            
-            # Get total count for pagination
-            count_query = select(func.count()).select_from(CameraFile)
-            for condition in conditions:
-                count_query = count_query.where(condition)
-                
-            count_result = await session.execute(count_query)
-            total = count_result.scalar()
-            
             # Apply sorting
             sort_column = getattr(CameraFile, sort_by, CameraFile.created_at)
-            if sort_desc:
-                query = query.order_by(desc(sort_column))
-            else:
-                query = query.order_by(asc(sort_column))
+            order = desc if sort_desc else asc
             
-            # Apply pagination
-            query = query.offset(skip).limit(limit)
+            # Fetch the page and the total count in one round trip
+            query = (
+                select(*_LIST_ITEM_COLUMNS, func.count().over().label("total"))
+                .where(*conditions)
+                .order_by(order(sort_column))
+                .limit(limit)
+            )
+            
+            # Keyset paging seeks past the cursor instead of scanning skipped rows
+            keyset = sort_column is CameraFile.created_at
+            if keyset:
+                query = query.order_by(order(CameraFile.id))
+            seek = keyset and cursor is not None
+            if seek:
+                key = tuple_(CameraFile.created_at, CameraFile.id)
+                query = query.where(key < tuple_(*cursor) if sort_desc else key > tuple_(*cursor))
+            else:
+                query = query.offset(skip)
             
-            # Execute the query
             result = await session.execute(query)
-            items = result.scalars().all()
+            rows = result.mappings().all()
+            
+            # Column values come straight from the database, so skip validation
+            items = [
+                CameraFileListItemSchema.construct(**{field: row[field] for field in _LIST_ITEM_FIELDS})
+                for row in rows
+            ]
+            if rows and not seek:
+                total = rows[0]["total"]
+            elif seek or skip > 0:
+                # No row carried the window count, or the seek narrowed it
+                count_query = select(func.count()).select_from(CameraFile).where(*conditions)
+                total = (await session.execute(count_query)).scalar()
+            else:
+                total = 0
+            
+            next_cursor = None
+            if keyset and len(items) == limit:
+                next_cursor = (items[-1].created_at, items[-1].id)
             
             return {
                 "items": items,
-                "total": total
+                "total": total,
+                "next_cursor": next_cursor
             }
     
-    async def update_upload_status(self, file_id: str, is_uploaded: bool, cloud_url: Optional[str] = None) -> Optional[CameraFile]:
+    async def update_upload_status(
+        self,
+        file_id: UUID,
+        is_uploaded: bool,
+        cloud_url: Optional[str] = None,
+        session: Optional[AsyncSession] = None
+    ) -> Optional[CameraFile]:
         """
         Update the upload status and cloud URL of a camera file.
         
@@ -215,50 +327,67 @@ class CameraFileRepository(BaseRepository):
             file_id: ID of the camera file
             is_uploaded: New upload status
             cloud_url: Optional cloud URL
+            session: Optional session to reuse instead of opening a new one
             
         Returns:
             Updated CameraFile instance or None if not found
         """
-        async with get_db_session() as session:
-            camera_file = await self.get_by_id(file_id)
-            if not camera_file:
-                return None
-                
-            camera_file.is_uploaded = is_uploaded
-            if cloud_url:
-                camera_file.cloud_url = cloud_url
-                
-            session.add(camera_file)
-            await session.refresh(camera_file)
-            return camera_file
+        values = {"is_uploaded": is_uploaded}
+        if cloud_url:
+            values["cloud_url"] = cloud_url
+            
+        async with get_db_session(session) as session:
+            result = await session.execute(
+                update(CameraFile)
+                .where(CameraFile.id == file_id)
+                .values(**values)
+                .returning(CameraFile)
+                .execution_options(synchronize_session=False)
+            )
+            return result.scalar_one_or_none()
     
-    async def delete_file(self, file_id: str) -> bool:
+    async def delete_file(self, file_id: UUID, session: Optional[AsyncSession] = None) -> bool:
         """
-        Delete a camera file record.
+        Delete a camera file record together with its child files.
         
         Args:
             file_id: ID of the camera file
+            session: Optional session to reuse instead of opening a new one
             
         Returns:
             True if deleted, False otherwise
         """
-        async with get_db_session() as session:
-            camera_file = await self.get_by_id(file_id)
-            if not camera_file:
-                return False
-                
-            await session.delete(camera_file)
-            return True
+        async with get_db_session(session) as session:
+            # The bulk DELETE bypasses the ORM delete-orphan cascade, so remove the
+            # children first or the parent_id foreign key rejects the delete
+            await session.execute(
+                delete(CameraFile)
+                .where(CameraFile.parent_id == file_id)
+                .execution_options(synchronize_session=False)
+            )
+            result = await session.execute(
+                delete(CameraFile)
+                .where(CameraFile.id == file_id)
+                .execution_options(synchronize_session=False)
+            )
+            return result.rowcount > 0
     
-    async def delete_multispectral_set(self, parent_id: str) -> bool:
+    async def delete_multispectral_set(self, parent_id: UUID, session: Optional[AsyncSession] = None) -> bool:
         """
         Delete a multispectral image set.
         
         Args:
             parent_id: ID of the parent file
+            session: Optional session to reuse instead of opening a new one
             
         Returns:
             True if deleted, False otherwise
         """
-        # Due to cascade delete setup, deleting the parent will also delete children
-        return await self.delete_file(parent_id)
\ No newline at end of file
+        # Parent and children go in one statement; the FK is checked at statement end
+        async with get_db_session(session) as session:
+            result = await session.execute(
+                delete(CameraFile)
+                .where(or_(CameraFile.id == parent_id, CameraFile.parent_id == parent_id))
+                .execution_options(synchronize_session=False)
+            )
+            return result.rowcount > 0
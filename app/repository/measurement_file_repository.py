@@ -1,16 +1,60 @@
+from datetime import datetime, timezone
 from typing import List, Optional
-from sqlalchemy import select
+from sqlalchemy import insert, select
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.models.measurement_file import MeasurementFileOrm
 from app.repository.base_repository import BaseRepository
 from app.utils.db_session import get_db_session
 
+# Columns written and read back by save_many
+_INSERT_COLUMNS = ("name", "google_drive_file_id", "measurement_id")
+_RETURNED_COLUMNS = ("id", "created_at", "updated_at")
+
 class MeasurementFileRepository(BaseRepository):
     """Repository for managing measurement files"""
     
     def __init__(self):
         super().__init__(MeasurementFileOrm)
     
+    async def save_many(self, files: List[MeasurementFileOrm], session=None) -> List[MeasurementFileOrm]:
+        """
+        Save several file records in one INSERT ... RETURNING. The rows go through a Core
+        insert, so the records are not added to the session; their generated columns are
+        filled in from the returned rows.
+
+        Args:
+            files: File records to save
+
+        Returns:
+            The saved file records with their IDs populated
+        """
+        if not files:
+            return files
+
+        # Every row needs the same keys to go out as one statement, so unset
+        # timestamps are filled in here instead of by the server default
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                **{column: getattr(file, column) for column in _INSERT_COLUMNS},
+                "created_at": file.created_at or now,
+                "updated_at": file.updated_at or now,
+            }
+            for file in files
+        ]
+
+        table = MeasurementFileOrm.__table__
+        stmt = insert(table).returning(
+            *(table.c[column] for column in _RETURNED_COLUMNS), sort_by_parameter_order=True
+        )
+        async with get_db_session(session) as session:
+            result = await session.execute(stmt, rows)
+            for file, returned in zip(files, result.all()):
+                for column, value in zip(_RETURNED_COLUMNS, returned):
+                    set_committed_value(file, column, value)
+        return files
+    
     async def get_by_measurement_id(self, measurement_id: int) -> List[MeasurementFileOrm]:
         """
         Get all files for a specific measurement
@@ -1,7 +1,9 @@
 from datetime import datetime
 from typing import List, Tuple, Optional
 
-from sqlalchemy import select, between, desc
+from sqlalchemy import select, between, desc, tuple_
+from sqlalchemy.orm import joinedload, noload, raiseload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.models.measurement import MeasurementInfoOrm, MeasurementInfoSchema
 from app.models.pageable import PageRequestSchema
@@ -9,6 +11,17 @@ from app.repository.base_repository import BaseRepository
 from app.utils.db_session import get_db_session
 
 
+def _files_options(with_files: bool, loader=selectinload) -> list:
+    """
+    Loader options for MeasurementInfoOrm: eager-load its files if with_files is set, otherwise
+    leave files as an empty list without querying them, and make any other relationship access
+    raise instead of silently lazy-loading (N+1) or failing outside the session
+    """
+    if with_files:
+        return [loader(MeasurementInfoOrm.files), raiseload("*")]
+    return [noload(MeasurementInfoOrm.files), raiseload("*")]
+
+
 class MeasurementRepository(BaseRepository):
     """
     Repository for measurement operations
@@ -17,46 +30,62 @@ class MeasurementRepository(BaseRepository):
     def __init__(self):
         super().__init__(MeasurementInfoOrm)
 
-    async def get_latest_measurement_info(self) -> List[MeasurementInfoOrm]:
+    async def get_latest_measurement_info(self, with_files: bool = True) -> List[MeasurementInfoOrm]:
         """
-        Get the latest measurements
+        Get the latest measurements, with their files eager loaded if with_files is set
         """
         async with get_db_session() as session:
             # Query for the latest 5 measurements ordered by date_time
             result = await session.execute(
                 select(MeasurementInfoOrm)
+                .options(*_files_options(with_files))
                 .order_by(desc(MeasurementInfoOrm.date_time))
                 .limit(5)
             )
             return result.scalars().all()
 
     async def get_measurement_history(
-        self, start_date: datetime, end_date: datetime
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        limit: Optional[int] = None,
+        cursor: Optional[Tuple[datetime, int]] = None,
+        with_files: bool = True,
     ) -> List[MeasurementInfoOrm]:
         """
-        Get measurement history within a date range
+        Get measurement history within a date range, with files eager loaded if with_files is set
+
+        Pass the (date_time, id) of the last row as cursor to fetch the next page
         """
         async with get_db_session() as session:
-            result = await session.execute(
+            query = (
                 select(MeasurementInfoOrm)
+                .options(*_files_options(with_files))
                 .where(between(MeasurementInfoOrm.date_time, start_date, end_date))
-                .order_by(desc(MeasurementInfoOrm.date_time))
+                .order_by(desc(MeasurementInfoOrm.date_time), desc(MeasurementInfoOrm.id))
+                .limit(limit)
             )
+            if cursor is not None:
+                query = query.where(
+                    tuple_(MeasurementInfoOrm.date_time, MeasurementInfoOrm.id) < tuple_(*cursor)
+                )
+            result = await session.execute(query)
             return result.scalars().all()
 
     async def get_measurement_by_id(
-        self, measurement_id: int
+        self, measurement_id: int, with_files: bool = True
     ) -> Optional[MeasurementInfoOrm]:
         """
-        Get a measurement by ID
+        Get a measurement by ID, with its files eager loaded if with_files is set
         """
         async with get_db_session() as session:
+            # A single parent row, so join its files instead of a second selectin query
             result = await session.execute(
-                select(MeasurementInfoOrm).where(
-                    MeasurementInfoOrm.id == measurement_id
-                )
+                select(MeasurementInfoOrm)
+                .options(*_files_options(with_files, loader=joinedload))
+                .where(MeasurementInfoOrm.id == measurement_id)
             )
-            return result.scalars().first()
+            return result.unique().scalars().first()
 
     async def save_new_measurement(
         self, measurement: MeasurementInfoOrm
@@ -67,8 +96,11 @@ class MeasurementRepository(BaseRepository):
         async with get_db_session() as session:
             session.add(measurement)
             # Commit happens automatically when context manager exits
-            await session.flush()  # Ensure the object has an ID
-            await session.refresh(measurement)
+            await session.flush()
+            # A new measurement has no files yet; mark the collection loaded so the
+            # schema conversion doesn't lazy-load it outside the greenlet
+            if "files" not in measurement.__dict__:
+                set_committed_value(measurement, "files", [])
             return MeasurementInfoSchema.from_orm(measurement)
 
     async def delete_measurement(self, measurement: MeasurementInfoOrm) -> None:
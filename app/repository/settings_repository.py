@@ -1,26 +1,39 @@
+import asyncio
+import time
 from datetime import datetime, timezone
+from typing import Any, Dict, Optional
 
-from sqlalchemy import select, func
+from sqlalchemy import select
 
 from app.models.measurement import MeasurementConfigOrm, MeasurementConfigSchema
 from app.utils.db_session import get_db_session
 
+# Process-local copy of the latest config row; refreshed on every update here and
+# re-read after CONFIG_CACHE_TTL seconds so updates made by other workers show up
+CONFIG_CACHE_TTL = 5
+_CONFIG_CACHE: Optional[MeasurementConfigSchema] = None
+_CONFIG_EXPIRES_AT = 0.0
+# Plain-dict form of _CONFIG_CACHE for callers that only serialize it
+_CONFIG_DICT: Optional[Dict[str, Any]] = None
+_CACHE_LOCK = asyncio.Lock()
+
+
+def _store_config(config: MeasurementConfigSchema) -> None:
+    global _CONFIG_CACHE, _CONFIG_DICT, _CONFIG_EXPIRES_AT
+    _CONFIG_CACHE = config
+    _CONFIG_DICT = None
+    _CONFIG_EXPIRES_AT = time.monotonic() + CONFIG_CACHE_TTL
+
+
+def _config_is_fresh() -> bool:
+    return _CONFIG_CACHE is not None and time.monotonic() < _CONFIG_EXPIRES_AT
+
 
 class SettingsRepository:
     """
     Repository for application settings operations
     """
 
-    async def _get_config_count(self) -> int:
-        """
-        Get count of config records in the database
-        """
-        async with get_db_session() as session:
-            count = await session.execute(
-                select(func.count()).select_from(MeasurementConfigOrm)
-            )
-            return count.scalar_one()
-
     async def _create_default_measurement_config(self) -> MeasurementConfigSchema:
         """
         Create a default measurement config in the database and return as schema
@@ -36,27 +49,46 @@ class SettingsRepository:
             )
             session.add(default_config)
             # Commit happens automatically when context manager exits
-            await session.flush()  # Ensure the object has an ID
-            await session.refresh(default_config)
+            await session.flush()
             return MeasurementConfigSchema.from_orm(default_config)
 
     async def get_measurement_config(self) -> MeasurementConfigSchema:
         """
         Get the current measurement configuration
         """
+        if not _config_is_fresh():
+            async with _CACHE_LOCK:
+                if not _config_is_fresh():
+                    _store_config(await self._load_measurement_config())
+        # Callers may adjust the returned schema, so hand out a copy
+        return _CONFIG_CACHE.copy()
+
+    async def get_measurement_config_dict(self) -> Dict[str, Any]:
+        """
+        Get the current measurement configuration as a plain dict, without building a schema
+        """
+        global _CONFIG_DICT
+        if _CONFIG_DICT is None or not _config_is_fresh():
+            # Reloads the config first if it expired, which also drops the stale dict
+            config = await self.get_measurement_config()
+            _CONFIG_DICT = config.dict()
+        return dict(_CONFIG_DICT)
+
+    async def _load_measurement_config(self) -> MeasurementConfigSchema:
+        """
+        Read the latest measurement configuration, creating the default if none exists
+        """
         async with get_db_session() as session:
-            config_count = await self._get_config_count()
-            if config_count == 0:
-                # Create and return default config as schema
-                return await self._create_default_measurement_config()
-            else:
-                result = await session.execute(
-                    select(MeasurementConfigOrm)
-                    .order_by(MeasurementConfigOrm.id.desc())
-                    .limit(1)
-                )
-                config = result.scalars().first()
-                return MeasurementConfigSchema.from_orm(config)
+            result = await session.execute(
+                select(MeasurementConfigOrm)
+                .order_by(MeasurementConfigOrm.id.desc())
+                .limit(1)
+            )
+            config = result.scalars().first()
+        if config is None:
+            # Create and return default config as schema
+            return await self._create_default_measurement_config()
+        return MeasurementConfigSchema.from_orm(config)
 
     async def update_measurement_config(
         self, config: MeasurementConfigSchema
@@ -65,10 +97,14 @@ class SettingsRepository:
         Update the measurement configuration
         """
         async with get_db_session() as session:
-            # Check if a config already exists
-            config_count = await self._get_config_count()
-        
-            if config_count == 0:
+            result = await session.execute(
+                select(MeasurementConfigOrm)
+                .order_by(MeasurementConfigOrm.id.desc())
+                .limit(1)
+            )
+            existing_config = result.scalars().first()
+
+            if existing_config is None:
                 # Create new config if none exists
                 new_config = MeasurementConfigOrm(
                     measurement_frequency=config.measurement_frequency,
@@ -79,18 +115,9 @@ class SettingsRepository:
                     length_of_ae=config.length_of_ae,
                 )
                 session.add(new_config)
-                await session.flush()  # Ensure the object has an ID
-                await session.refresh(new_config)
-                return MeasurementConfigSchema.from_orm(new_config)
+                await session.flush()
+                updated = MeasurementConfigSchema.from_orm(new_config)
             else:
-                # Update existing config
-                result = await session.execute(
-                    select(MeasurementConfigOrm)
-                    .order_by(MeasurementConfigOrm.id.desc())
-                    .limit(1)
-                )
-                existing_config = result.scalars().first()
-            
                 # Update fields
                 existing_config.measurement_frequency = config.measurement_frequency
                 existing_config.first_measurement = config.first_measurement
@@ -100,5 +127,8 @@ class SettingsRepository:
                 existing_config.length_of_ae = config.length_of_ae
             
                 await session.flush()
-                await session.refresh(existing_config)
-                return MeasurementConfigSchema.from_orm(existing_config)
+                updated = MeasurementConfigSchema.from_orm(existing_config)
+
+        # Only cache the config once the commit above has succeeded
+        _store_config(updated)
+        return _CONFIG_CACHE.copy()
@@ -1,10 +1,24 @@
+import asyncio
 from typing import Optional
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
-from app.models.user import UserOrm, pwd_context
+from app.models.user import UserOrm, get_pwd_context
 from app.repository.base_repository import BaseRepository
 from app.utils.db_session import get_db_session
 
+# Columns needed by UserResponseSchema; password hashes and refresh tokens stay unloaded
+_USER_LIST_COLUMNS = (
+    UserOrm.id,
+    UserOrm.created_at,
+    UserOrm.updated_at,
+    UserOrm.first_name,
+    UserOrm.last_name,
+    UserOrm.user_name,
+    UserOrm.is_admin,
+)
+
 
 class UserRepository(BaseRepository):
     """
@@ -14,60 +28,80 @@ class UserRepository(BaseRepository):
     def __init__(self):
         super().__init__(UserOrm)
 
-    async def get_all_users(self) -> list[UserOrm]:
+    async def get_all_users(
+        self, *columns, session: Optional[AsyncSession] = None
+    ) -> list[UserOrm]:
         """
         Get all users from the database
+
+        Args:
+            columns: UserOrm column attributes to load; defaults to the public profile fields
         """
-        async with get_db_session() as session:
-            result = await session.execute(select(UserOrm))
+        async with get_db_session(session) as session:
+            result = await session.execute(
+                select(UserOrm).options(load_only(*(columns or _USER_LIST_COLUMNS)))
+            )
             users = result.scalars().all()
             return users
 
-    async def get_user_by_id(self, user_id: int) -> Optional[UserOrm]:
+    async def get_user_by_id(
+        self, user_id: int, *, session: Optional[AsyncSession] = None
+    ) -> Optional[UserOrm]:
         """
         Get a user by ID
         """
-        async with get_db_session() as session:
-            result = await session.execute(select(UserOrm).where(UserOrm.id == user_id))
-            user = result.scalars().first()
-            return user
+        async with get_db_session(session) as session:
+            # Identity-map hit when the user was already loaded in this session
+            return await session.get(UserOrm, user_id)
 
-    async def get_user_by_username(self, username: str) -> Optional[UserOrm]:
+    async def get_user_by_username(
+        self, username: str, *, session: Optional[AsyncSession] = None
+    ) -> Optional[UserOrm]:
         """
         Get a user by username
         """
-        async with get_db_session() as session:
+        async with get_db_session(session) as session:
             result = await session.execute(select(UserOrm).where(UserOrm.user_name == username))
             user = result.scalars().first()
             return user
 
-    async def create_user(self, user: UserOrm) -> UserOrm:
+    async def create_user(self, user: UserOrm, *, session: Optional[AsyncSession] = None) -> UserOrm:
         """
         Create a new user with password hashing
         """
-        # Hash the password before saving
-        user.password = self._hash_password(user.password)
-        return await self.save(user)
+        # Hash the password before saving; hashing is CPU bound, keep it off the event loop
+        user.password = await asyncio.to_thread(self._hash_password, user.password)
+        async with get_db_session(session) as session:
+            session.add(user)
+            await session.flush()
+            return user
 
-    async def update_user_refresh_token(self, user_id: int, refresh_token: Optional[str]) -> None:
+    async def update_user_refresh_token(
+        self, user_id: int, refresh_token: Optional[str], *, session: Optional[AsyncSession] = None
+    ) -> None:
         """
         Update or remove the refresh token for a user
         """
-        async with get_db_session() as session:
-            user = await session.get(UserOrm, user_id)
-            if user:
-                user.refresh_token = refresh_token
-                # Commit happens automatically when context manager exits
+        async with get_db_session(session) as session:
+            # Single UPDATE, no load of the user row first
+            await session.execute(
+                update(UserOrm)
+                .where(UserOrm.id == user_id)
+                .values(refresh_token=refresh_token)
+            )
+            # Commit happens automatically when context manager exits
 
-    async def delete_user_refresh_token(self, user_id: int) -> None:
+    async def delete_user_refresh_token(
+        self, user_id: int, *, session: Optional[AsyncSession] = None
+    ) -> None:
         """
         Remove the refresh token for a user
         """
-        await self.update_user_refresh_token(user_id, None)
+        await self.update_user_refresh_token(user_id, None, session=session)
 
     @staticmethod
     def _hash_password(password: str) -> str:
         """
         Hash a password for secure storage
         """
-        return pwd_context.hash(password)
\ No newline at end of file
+        return get_pwd_context().hash(password)
\ No newline at end of file
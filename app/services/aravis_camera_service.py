@@ -1,7 +1,9 @@
+import asyncio
+import io
 import logging
 import os
 from pathlib import Path
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
 
 import gi
 import numpy as np
@@ -20,6 +22,54 @@ from PIL import Image
 gi.require_version("Aravis", "0.10")
 from gi.repository import Aravis  # noqa: E402
 
+# Channel count and dtype per Aravis pixel format, keyed by the integer constant.
+# Anything not listed is treated as 8-bit mono
+_PIXEL_FORMAT_TABLE = {
+    Aravis.PIXEL_FORMAT_RGB_8_PACKED: (3, np.uint8),
+    Aravis.PIXEL_FORMAT_BGR_8_PACKED: (3, np.uint8),
+    Aravis.PIXEL_FORMAT_RGBA_8_PACKED: (4, np.uint8),
+    Aravis.PIXEL_FORMAT_BGRA_8_PACKED: (4, np.uint8),
+    Aravis.PIXEL_FORMAT_MONO_8: (1, np.uint8),
+}
+
+
+# PIL (mode, raw decoder mode) per pixel format, so frames can be decoded straight
+# from the buffer bytes; BGR data is swapped by the decoder
+_PIL_MODE_TABLE = {
+    Aravis.PIXEL_FORMAT_RGB_8_PACKED: ("RGB", "RGB"),
+    Aravis.PIXEL_FORMAT_BGR_8_PACKED: ("RGB", "BGR"),
+    Aravis.PIXEL_FORMAT_RGBA_8_PACKED: ("RGBA", "RGBA"),
+    Aravis.PIXEL_FORMAT_BGRA_8_PACKED: ("RGBA", "BGRA"),
+    Aravis.PIXEL_FORMAT_MONO_8: ("L", "L"),
+}
+
+# Raw frame as read from an Aravis buffer: (data, width, height, pixel_format)
+Frame = Tuple[bytes, int, int, int]
+
+# Pixel formats to select, in order of preference
+PREFERRED_PIXEL_FORMATS = ("RGBA8", "BGRA8", "RGBa8", "BGRa8", "RGB8", "BGR8", "Mono8")
+
+# Number of buffers pushed to each capture stream
+STREAM_BUFFER_COUNT = 10
+
+
+def _reshape_buffer(data, width: int, height: int, pixel_format: int) -> np.ndarray:
+    """
+    View raw buffer data as an image array shaped for its pixel format.
+
+    Args:
+        data: Raw image bytes from an Aravis buffer
+        width: Image width in pixels
+        height: Image height in pixels
+        pixel_format: Aravis pixel format of the buffer
+
+    Returns:
+        np.ndarray: (height, width) for mono, (height, width, channels) otherwise
+    """
+    channels, dtype = _PIXEL_FORMAT_TABLE.get(pixel_format, (1, np.uint8))
+    shape = (height, width, channels) if channels > 1 else (height, width)
+    return np.frombuffer(data, dtype=dtype).reshape(shape)
+
 
 class AravisCameraService:
     """Service for interacting with cameras using the Aravis library."""
@@ -36,6 +86,10 @@ class AravisCameraService:
         self.camera = None
         self.camera_id = camera_id
         self.stream = None
+        # Camera capabilities, probed once in connect()
+        self._is_gv = False
+        self._pixel_formats: Tuple[str, ...] = ()
+        self._exposure_bounds: Optional[Tuple[float, float]] = None
 
     def connect(self) -> bool:
         """Connect to the camera.
@@ -60,6 +114,8 @@ class AravisCameraService:
             self.logger.info(f"Connected to camera: {self.camera.get_model_name()}")
             self.logger.info(f"Vendor: {self.camera.get_vendor_name()}")
 
+            self._probe_camera()
+
             # Configure camera with default settings
             self._configure_camera()
 
@@ -69,6 +125,18 @@ class AravisCameraService:
             self.logger.error(f"Failed to connect to camera: {e}")
             return False
 
+    def _probe_camera(self) -> None:
+        """Read the camera capabilities once so later calls don't go through GObject."""
+        self._is_gv = self.camera.is_gv_device()
+        self._pixel_formats = tuple(
+            self.camera.dup_available_pixel_formats_as_strings() or ()
+        )
+        self._exposure_bounds = (
+            tuple(self.camera.get_exposure_time_bounds())
+            if self.camera.is_exposure_time_available()
+            else None
+        )
+
     def _configure_camera(self) -> None:
         """Configure the camera with optimized settings."""
         try:
@@ -76,7 +144,7 @@ class AravisCameraService:
             self.camera.set_acquisition_mode(Aravis.AcquisitionMode.SINGLE_FRAME)
 
             # Optimize GigE Vision settings if applicable
-            if self.camera.is_gv_device():
+            if self._is_gv:
                 self.camera.gv_auto_packet_size()
                 packet_size = self.camera.gv_get_packet_size()
                 self.logger.info(f"GigE packet size set to: {packet_size} bytes")
@@ -88,39 +156,23 @@ class AravisCameraService:
                     pass
 
             # Set optimal pixel format (preferring RGBA8 if available)
-            pixel_formats = self.camera.dup_available_pixel_formats_as_strings()
+            pixel_formats = self._pixel_formats
             if pixel_formats:
                 self.logger.info(f"Available pixel formats: {', '.join(pixel_formats)}")
 
-                # Try to find RGBA format (for color image)
-                rgba_formats = ["RGBA8", "BGRA8", "RGBa8", "BGRa8"]
-                selected_format = None
-
-                for fmt in rgba_formats:
-                    if fmt in pixel_formats:
-                        selected_format = fmt
-                        break
-
-                # Fall back to RGB if no RGBA format
-                if not selected_format:
-                    rgb_formats = ["RGB8", "BGR8"]
-                    for fmt in rgb_formats:
-                        if fmt in pixel_formats:
-                            selected_format = fmt
-                            break
-
-                # Fall back to Mono8 or first available
-                if not selected_format:
-                    selected_format = (
-                        "Mono8" if "Mono8" in pixel_formats else pixel_formats[0]
-                    )
+                # Prefer RGBA (for color image), then RGB, then Mono8, else first available
+                available = frozenset(pixel_formats)
+                selected_format = next(
+                    (fmt for fmt in PREFERRED_PIXEL_FORMATS if fmt in available),
+                    pixel_formats[0],
+                )
 
                 self.camera.set_pixel_format_from_string(selected_format)
                 self.logger.info(f"Using pixel format: {selected_format}")
 
             # Set reasonable exposure time
-            if self.camera.is_exposure_time_available():
-                min_exp, max_exp = self.camera.get_exposure_time_bounds()
+            if self._exposure_bounds:
+                min_exp, max_exp = self._exposure_bounds
                 exposure = min_exp + (max_exp - min_exp) * 0.1  # Use 10% of range
                 self.camera.set_exposure_time(exposure)
                 self.logger.info(f"Set exposure time to {exposure} µs")
@@ -154,6 +206,35 @@ class AravisCameraService:
         Returns:
             np.ndarray: The captured image as a NumPy array, or None if capture failed.
         """
+        frame = self._capture_frame()
+        if frame is None:
+            return None
+        return _reshape_buffer(*frame)
+
+    def capture_pil_image(self) -> Optional[Image.Image]:
+        """
+        Capture a single image from the camera as a PIL image.
+
+        The frame is decoded directly from the buffer bytes, without an
+        intermediate NumPy array.
+
+        Returns:
+            Image.Image: The captured image, or None if capture failed.
+        """
+        frame = self._capture_frame()
+        if frame is None:
+            return None
+        data, width, height, pixel_format = frame
+        mode, raw_mode = _PIL_MODE_TABLE.get(pixel_format, ("L", "L"))
+        return Image.frombuffer(mode, (width, height), data, "raw", raw_mode, 0, 1)
+
+    def _capture_frame(self) -> Optional[Frame]:
+        """
+        Acquire a single raw frame from the camera.
+
+        Returns:
+            Frame: (data, width, height, pixel_format), or None if capture failed.
+        """
         if not self.camera:
             self.logger.error("No camera connected")
             return None
@@ -172,9 +253,8 @@ class AravisCameraService:
             self._optimize_stream(self.stream)
 
             # Create and push multiple buffers to the stream
-            for _ in range(10):  # Increase buffer count for more reliable streaming
-                buffer = Aravis.Buffer.new_allocate(payload)
-                self.stream.push_buffer(buffer)
+            for _ in range(STREAM_BUFFER_COUNT):
+                self.stream.push_buffer(Aravis.Buffer.new_allocate(payload))
 
             # Start acquisition
             self.logger.info("Starting acquisition...")
@@ -205,27 +285,10 @@ class AravisCameraService:
 
             self.logger.info(f"Successfully captured image: {width}x{height}")
 
-            # Use pixel format to determine array shape and type
+            # Pixel format determines how the data is shaped/decoded
             pixel_format = buffer.get_image_pixel_format()
 
-            # Create numpy array from buffer data
-            if "RGB" in str(pixel_format) or "BGR" in str(pixel_format):
-                # RGB format - 3 channels
-                image_array = np.frombuffer(data, dtype=np.uint8).reshape(
-                    (height, width, 3)
-                )
-            elif "RGBA" in str(pixel_format) or "BGRA" in str(pixel_format):
-                # RGBA format - 4 channels
-                image_array = np.frombuffer(data, dtype=np.uint8).reshape(
-                    (height, width, 4)
-                )
-            else:
-                # Default to mono format
-                image_array = np.frombuffer(data, dtype=np.uint8).reshape(
-                    (height, width)
-                )
-
-            return image_array
+            return data, width, height, pixel_format
 
         except Exception as e:
             self.logger.error(f"Image capture error: {e}")
@@ -234,12 +297,12 @@ class AravisCameraService:
             # Clean up
             self._cleanup_acquisition()
 
-    def _fallback_direct_acquisition(self) -> Optional[np.ndarray]:
+    def _fallback_direct_acquisition(self) -> Optional[Frame]:
         """
         Fallback method using direct acquisition when stream method fails.
 
         Returns:
-            np.ndarray: The captured image as a NumPy array, or None if capture failed.
+            Frame: (data, width, height, pixel_format), or None if capture failed.
         """
         self.logger.info("Trying fallback direct acquisition method...")
         try:
@@ -273,27 +336,10 @@ class AravisCameraService:
 
             self.logger.info(f"Direct acquisition successful: {width}x{height}")
 
-            # Use pixel format to determine array shape and type
+            # Pixel format determines how the data is shaped/decoded
             pixel_format = buffer.get_image_pixel_format()
 
-            # Create numpy array from buffer data
-            if "RGB" in str(pixel_format) or "BGR" in str(pixel_format):
-                # RGB format - 3 channels
-                image_array = np.frombuffer(data, dtype=np.uint8).reshape(
-                    (height, width, 3)
-                )
-            elif "RGBA" in str(pixel_format) or "BGRA" in str(pixel_format):
-                # RGBA format - 4 channels
-                image_array = np.frombuffer(data, dtype=np.uint8).reshape(
-                    (height, width, 4)
-                )
-            else:
-                # Default to mono format
-                image_array = np.frombuffer(data, dtype=np.uint8).reshape(
-                    (height, width)
-                )
-
-            return image_array
+            return data, width, height, pixel_format
 
         except Exception as e:
             self.logger.error(f"Fallback acquisition error: {e}")
@@ -306,46 +352,96 @@ class AravisCameraService:
             except Exception as e:
                 self.logger.error(f"Error stopping camera in fallback: {e}")
 
-    def get_image_blob(self, format: str = "PNG") -> Optional[bytes]:
+    def get_image_blob(
+        self, format: str = "PNG", compress_level: int = 6, quality: int = 85
+    ) -> Optional[bytes]:
         """
         Capture an image and return it as a binary blob.
 
         Args:
             format: Image format to use (PNG, JPEG, etc.)
+            compress_level: PNG zlib level 0-9; lower is faster and larger (1 suits previews)
+            quality: JPEG quality 1-95
 
         Returns:
             bytes: Image data as binary blob, or None if capture failed
         """
-        image_array = self.capture_image()
-        if image_array is None:
-            return None
+        stream = self.get_image_stream(format, compress_level, quality)
+        return stream.getvalue() if stream is not None else None
 
-        try:
-            # Convert numpy array to PIL Image
-            if len(image_array.shape) == 2:
-                # Grayscale image
-                pil_image = Image.fromarray(image_array, "L")
-            elif image_array.shape[2] == 3:
-                # RGB image
-                pil_image = Image.fromarray(image_array, "RGB")
-            elif image_array.shape[2] == 4:
-                # RGBA image
-                pil_image = Image.fromarray(image_array, "RGBA")
-            else:
-                self.logger.error(f"Unsupported image shape: {image_array.shape}")
-                return None
+    async def get_image_blob_async(
+        self, format: str = "PNG", compress_level: int = 6, quality: int = 85
+    ) -> Optional[bytes]:
+        """
+        Awaitable get_image_blob; the capture and the encode run in a worker thread.
+        """
+        return await asyncio.to_thread(self.get_image_blob, format, compress_level, quality)
+
+    def get_image_stream(
+        self, format: str = "PNG", compress_level: int = 6, quality: int = 85
+    ) -> Optional[io.BytesIO]:
+        """
+        Capture an image and return it as a readable in-memory stream.
+
+        Lets uploaders read the encoded image in chunks straight from the encoder's
+        buffer instead of going through a separate bytes object.
+
+        Args:
+            format: Image format to use (PNG, JPEG, etc.)
+            compress_level: PNG zlib level 0-9; lower is faster and larger (1 suits previews)
+            quality: JPEG quality 1-95
 
-            # Save image to bytes buffer
-            import io
+        Returns:
+            io.BytesIO: Encoded image positioned at the start, or None if capture failed
+        """
+        pil_image = self.capture_pil_image()
+        if pil_image is None:
+            return None
 
-            buffer = io.BytesIO()
-            pil_image.save(buffer, format=format)
-            return buffer.getvalue()
+        try:
+            return self._encode_image(pil_image, format, compress_level, quality)
 
         except Exception as e:
             self.logger.error(f"Failed to create image blob: {e}")
             return None
 
+    async def get_image_stream_async(
+        self, format: str = "PNG", compress_level: int = 6, quality: int = 85
+    ) -> Optional[io.BytesIO]:
+        """
+        Awaitable get_image_stream; the capture and the encode run in a worker thread.
+        """
+        return await asyncio.to_thread(self.get_image_stream, format, compress_level, quality)
+
+    @staticmethod
+    def _encode_image(
+        pil_image: Image.Image, format: str, compress_level: int, quality: int
+    ) -> io.BytesIO:
+        """
+        Encode an image into an in-memory stream in the given format.
+
+        Args:
+            pil_image: Image to encode
+            format: Image format to use (PNG, JPEG, etc.)
+            compress_level: PNG zlib level 0-9
+            quality: JPEG quality 1-95
+
+        Returns:
+            io.BytesIO: Encoded image data, positioned at the start
+        """
+        # Encoder cost is dominated by these settings on large frames
+        save_options = {}
+        if format.upper() == "PNG":
+            save_options["compress_level"] = compress_level
+        elif format.upper() in ("JPEG", "JPG"):
+            save_options["quality"] = quality
+
+        # Save image to bytes buffer
+        buffer = io.BytesIO()
+        pil_image.save(buffer, format=format, **save_options)
+        buffer.seek(0)
+        return buffer
+
     def save_image_file(self, filepath: Union[str, Path], format: str = None) -> bool:
         """
         Capture an image and save it to a file.
@@ -357,25 +453,11 @@ class AravisCameraService:
         Returns:
             bool: True if successful, False otherwise
         """
-        image_array = self.capture_image()
-        if image_array is None:
+        pil_image = self.capture_pil_image()
+        if pil_image is None:
             return False
 
         try:
-            # Convert numpy array to PIL Image
-            if len(image_array.shape) == 2:
-                # Grayscale image
-                pil_image = Image.fromarray(image_array, "L")
-            elif image_array.shape[2] == 3:
-                # RGB image
-                pil_image = Image.fromarray(image_array, "RGB")
-            elif image_array.shape[2] == 4:
-                # RGBA image
-                pil_image = Image.fromarray(image_array, "RGBA")
-            else:
-                self.logger.error(f"Unsupported image shape: {image_array.shape}")
-                return False
-
             # Save to file
             filepath = Path(filepath)
             filepath.parent.mkdir(parents=True, exist_ok=True)
@@ -388,38 +470,34 @@ class AravisCameraService:
             self.logger.error(f"Failed to save image: {e}")
             return False
 
+    async def save_image_file_async(self, filepath: Union[str, Path], format: str = None) -> bool:
+        """
+        Awaitable save_image_file; the capture and the file write run in a worker thread.
+        """
+        return await asyncio.to_thread(self.save_image_file, filepath, format)
+
     def _cleanup_acquisition(self) -> None:
         """Clean up resources after acquisition."""
         try:
-            # First clean up the stream if it exists
+            # Stop the camera first so no buffer is still being filled
+            if self.camera:
+                try:
+                    self.camera.stop_acquisition()
+                except Exception as e:
+                    self.logger.debug(f"Error stopping acquisition: {e}")
+
             if self.stream:
-                # Try to pop all remaining buffers before stopping
+                # Try to pop all remaining buffers
                 try:
-                    for _ in range(10):
+                    for _ in range(STREAM_BUFFER_COUNT):
                         buffer = self.stream.try_pop_buffer()
                         if buffer is None:
                             break
                 except Exception as e:
                     self.logger.debug(f"Error popping buffers: {e}")
 
-                # Clear the stream reference
-                local_stream = self.stream
                 self.stream = None
 
-                # Now it's safe to clean up the camera
-                if self.camera:
-                    try:
-                        self.camera.stop_acquisition()
-                    except Exception as e:
-                        self.logger.debug(f"Error stopping acquisition: {e}")
-            else:
-                # Just stop the camera acquisition if no stream
-                if self.camera:
-                    try:
-                        self.camera.stop_acquisition()
-                    except Exception as e:
-                        self.logger.debug(f"Error stopping acquisition: {e}")
-
         except Exception as e:
             self.logger.error(f"Cleanup error: {e}")
 
@@ -1,20 +1,64 @@
 import os
+import stat
+import asyncio
+import queue
 import logging
+import threading
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import NoCredentialsError, PartialCredentialsError, ClientError
-from typing import Optional
+from typing import Iterator, Optional, Tuple
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# S3 PUTs are latency-bound, so use more threads than cores
+DEFAULT_UPLOAD_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+
+# S3 keys use forward slashes; only Windows paths need converting
+_NEEDS_SEP_FIX = os.sep != '/'
+
+# Files discovered but not yet picked up by an upload worker; bounds memory on huge trees
+UPLOAD_QUEUE_SIZE = 1024
+
+MB = 1024 * 1024
+
+# HTTPS connections the shared client keeps open. Upload workers and multipart threads
+# check connections out of this pool, so max_concurrency (parts of one file in flight)
+# should stay at or below it, or part uploads queue on checkout
+S3_MAX_POOL_CONNECTIONS = 64
+
+# Attempts per S3 request. Adaptive mode backs off exponentially with jitter on throttling
+# and 5xx errors and rate-limits the whole client, which covers put_object, upload_file
+# and each multipart part alike
+S3_MAX_ATTEMPTS = 10
+
+# Files up to this size are sent with a single PutObject instead of s3transfer
+SINGLE_PUT_MAX_SIZE = 5 * MB
+
+# Size of the reads s3transfer makes from a file while uploading its parts
+UPLOAD_IO_CHUNKSIZE = 1 * MB
+
 class CloudUploaderService:
     """
     Service for uploading files to a cloud storage provider, initially AWS S3.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        multipart_threshold: int = 64 * MB,
+        multipart_chunksize: int = 64 * MB,
+        max_concurrency: int = 16,
+    ):
         """
         Initializes the CloudUploaderService.
+
+        Args:
+            multipart_threshold: File size from which uploads are split into parts.
+            multipart_chunksize: Size of each part; larger parts give higher per-stream throughput.
+            max_concurrency: Number of parts of a single file uploaded in parallel; keep it at or
+                             below S3_MAX_POOL_CONNECTIONS.
         
         AWS credentials (AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY) and region (AWS_DEFAULT_REGION)
         should be configured in the environment or via other Boto3 configuration methods
@@ -35,9 +79,43 @@ class CloudUploaderService:
         # aws_secret_access_key=self.aws_secret_access_key,
         # region_name=self.aws_region_name
         # )
-        # For simplicity in this example, the client will be created per method call,
-        # or you can initialize it here if credentials are confirmed to be available.
-        pass
+        # The client is created on first use and shared by all uploads; botocore clients
+        # are thread-safe and keep their HTTPS connection pool between calls.
+        self._s3_client = None
+        self._client_lock = threading.RLock()
+        self._transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_chunksize,
+            max_concurrency=max_concurrency,
+            use_threads=True,
+            max_io_queue=1000,
+            io_chunksize=UPLOAD_IO_CHUNKSIZE,
+        )
+
+    def _get_client(self):
+        """
+        Returns the shared S3 client, creating it on first use.
+
+        Raises:
+            NoCredentialsError, PartialCredentialsError: If credentials cannot be resolved.
+        """
+        if self._s3_client is None:
+            with self._client_lock:
+                if self._s3_client is None:
+                    # Boto3 will attempt to find credentials
+                    self._s3_client = boto3.session.Session().client(
+                        's3',
+                        config=Config(
+                            max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+                            tcp_keepalive=True,
+                            connect_timeout=5,
+                            read_timeout=60,
+                            # Bucket in the hostname: one endpoint per bucket, no path-style redirect
+                            s3={'addressing_style': 'virtual'},
+                            retries={'max_attempts': S3_MAX_ATTEMPTS, 'mode': 'adaptive'},
+                        ),
+                    )
+        return self._s3_client
 
     def upload_file_to_s3(self, local_file_path: str, bucket_name: str, s3_object_name: Optional[str] = None) -> bool:
         """
@@ -51,13 +129,33 @@ class CloudUploaderService:
         Returns:
             True if the file was uploaded successfully, False otherwise.
         """
-        if not os.path.exists(local_file_path) or not os.path.isfile(local_file_path):
+        # One stat() answers exists, is-a-file and size
+        try:
+            file_stat = os.stat(local_file_path)
+        except OSError:
+            file_stat = None
+        if file_stat is None or not stat.S_ISREG(file_stat.st_mode):
             logger.error(f"Local file not found or is not a file: {local_file_path}")
             return False
 
         if s3_object_name is None:
             s3_object_name = os.path.basename(local_file_path)
-        
+
+        return self._upload_file_trusted(local_file_path, bucket_name, s3_object_name, file_stat.st_size)
+
+    def _upload_file_trusted(self, local_file_path: str, bucket_name: str, s3_object_name: str, size: int) -> bool:
+        """
+        Uploads a file already known to be a regular file of the given size.
+
+        Args:
+            local_file_path: Path to the file on the local filesystem.
+            bucket_name: The name of the S3 bucket.
+            s3_object_name: The object name (path) in S3.
+            size: File size in bytes.
+
+        Returns:
+            True if the file was uploaded successfully, False otherwise.
+        """
         # Ensure AWS credentials and region are configured.
         # These can be set as environment variables:
         # AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_DEFAULT_REGION
@@ -70,7 +168,7 @@ class CloudUploaderService:
 
             # It's better to let boto3 find credentials from environment or shared config files.
             # If you must pass them explicitly, ensure they are not hardcoded.
-            s3_client = boto3.client('s3') # Boto3 will attempt to find credentials
+            s3_client = self._get_client()
 
         except NoCredentialsError:
             logger.error("AWS S3 credentials not found. Configure AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY.")
@@ -85,7 +183,12 @@ class CloudUploaderService:
 
         try:
             logger.info(f"Uploading {local_file_path} to S3 bucket '{bucket_name}' as '{s3_object_name}'")
-            s3_client.upload_file(local_file_path, bucket_name, s3_object_name)
+            if size <= SINGLE_PUT_MAX_SIZE:
+                # One PutObject call, without setting up an s3transfer manager and its threads
+                with open(local_file_path, 'rb') as f:
+                    s3_client.put_object(Bucket=bucket_name, Key=s3_object_name, Body=f, ContentLength=size)
+            else:
+                s3_client.upload_file(local_file_path, bucket_name, s3_object_name, Config=self._transfer_config)
             logger.info(f"Successfully uploaded {local_file_path} to {bucket_name}/{s3_object_name}")
             return True
         except FileNotFoundError:
@@ -105,15 +208,56 @@ class CloudUploaderService:
             logger.error(f"An unexpected error occurred during S3 upload of {local_file_path}: {e}")
             return False
 
-    def upload_folder_to_s3(self, local_folder_path: str, bucket_name: str, s3_destination_folder: Optional[str] = None) -> dict:
+    @classmethod
+    def _iter_files(cls, folder_path: str) -> Iterator[os.DirEntry]:
+        """
+        Recursively yields a DirEntry for every regular file below folder_path.
+        DirEntry caches the type from the directory listing, so telling files from folders
+        needs no stat() call.
+        """
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from cls._iter_files(entry.path)
+                elif entry.is_file():  # Symlinked files are uploaded, as with os.walk
+                    yield entry
+
+    @classmethod
+    def _iter_upload_pairs(cls, local_folder_path: str, s3_destination_folder: Optional[str]) -> Iterator[Tuple[str, str, int]]:
+        """
+        Yields (local_file_path, s3_object_name, size) for every file below local_folder_path.
+        The size takes one stat() per file (DirEntry caches it on Windows only); the upload
+        path needs it to choose between PutObject and a multipart upload.
+        """
+        # Scandir paths are local_folder_path + sep + relative path, so the S3 key is a fixed
+        # prefix plus a slice of the path (forward slashes for S3)
+        base_len = len(os.path.join(local_folder_path, ''))
+        prefix = (s3_destination_folder.replace("\\", "/").rstrip('/') + '/') if s3_destination_folder else ''
+        for entry in cls._iter_files(local_folder_path):
+            relative_path = entry.path[base_len:]
+            if _NEEDS_SEP_FIX:
+                relative_path = relative_path.replace(os.sep, '/')
+            s3_object_name = prefix + relative_path
+            yield entry.path, s3_object_name, entry.stat().st_size
+
+    def upload_folder_to_s3(
+        self,
+        local_folder_path: str,
+        bucket_name: str,
+        s3_destination_folder: Optional[str] = None,
+        max_workers: int = DEFAULT_UPLOAD_WORKERS,
+    ) -> dict:
         """
         Uploads all files from a local folder to a specified S3 bucket and destination folder.
+        A producer thread walks the folder into a bounded queue while worker threads upload
+        from it over the shared S3 client, so the walk and the uploads overlap.
 
         Args:
             local_folder_path: The path to the local folder containing files to upload.
             bucket_name: The name of the S3 bucket.
             s3_destination_folder: Optional. The destination folder path within the S3 bucket. 
                                    If None, files will be uploaded to the root of the bucket.
+            max_workers: Number of files uploaded in parallel; values below 1 mean one worker.
 
         Returns:
             A dictionary with counts of successful and failed uploads.
@@ -123,29 +267,79 @@ class CloudUploaderService:
             logger.error(f"Local folder not found or is not a directory: {local_folder_path}")
             return {"successful_uploads": 0, "failed_uploads": 0, "error": "Local folder not found."}
 
-        successful_uploads = 0
-        failed_uploads = 0
-
-        for root, _, files in os.walk(local_folder_path):
-            for filename in files:
-                local_file_path = os.path.join(root, filename)
-                
-                # Determine the S3 object name, including the relative path from the local_folder_path
-                relative_path = os.path.relpath(local_file_path, local_folder_path)
-                
-                if s3_destination_folder:
-                    s3_object_name = os.path.join(s3_destination_folder, relative_path).replace("\\", "/") # Ensure forward slashes for S3
-                else:
-                    s3_object_name = relative_path.replace("\\", "/")
+        # Without a consumer the producer would block forever on a full queue
+        max_workers = max(1, max_workers)
+        work_queue: queue.Queue = queue.Queue(maxsize=UPLOAD_QUEUE_SIZE)
+        cancelled = threading.Event()
+        counts = {"successful_uploads": 0, "failed_uploads": 0}
+        counts_lock = threading.Lock()
+
+        def produce() -> None:
+            try:
+                for item in self._iter_upload_pairs(local_folder_path, s3_destination_folder):
+                    if cancelled.is_set():
+                        break
+                    work_queue.put(item)
+            except OSError as e:
+                logger.error(f"Error walking local folder {local_folder_path}: {e}")
+            finally:
+                # One sentinel per worker; workers keep draining, so these puts can't deadlock
+                for _ in range(max_workers):
+                    work_queue.put(None)
 
-                if self.upload_file_to_s3(local_file_path, bucket_name, s3_object_name):
-                    successful_uploads += 1
+        def consume() -> None:
+            # Tally locally and publish once, so workers never contend on the shared counts
+            successful, failed = 0, 0
+            while True:
+                item = work_queue.get()
+                if item is None:
+                    break
+                if cancelled.is_set():
+                    continue
+                local_file_path, s3_object_name, size = item
+                if self._upload_file_trusted(local_file_path, bucket_name, s3_object_name, size):
+                    successful += 1
                 else:
-                    failed_uploads += 1
-        
+                    failed += 1
+            with counts_lock:
+                counts["successful_uploads"] += successful
+                counts["failed_uploads"] += failed
+
+        threads = [threading.Thread(target=produce, name="s3-folder-walk", daemon=True)]
+        threads += [
+            threading.Thread(target=consume, name=f"s3-upload-{i}", daemon=True)
+            for i in range(max_workers)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        except BaseException:
+            # E.g. KeyboardInterrupt: stop walking and let workers drop the queued files
+            cancelled.set()
+            raise
+
+        successful_uploads = counts["successful_uploads"]
+        failed_uploads = counts["failed_uploads"]
         logger.info(f"Folder upload summary: {successful_uploads} successful, {failed_uploads} failed.")
         return {"successful_uploads": successful_uploads, "failed_uploads": failed_uploads}
 
+    async def upload_folder_to_s3_async(
+        self,
+        local_folder_path: str,
+        bucket_name: str,
+        s3_destination_folder: Optional[str] = None,
+        max_workers: int = DEFAULT_UPLOAD_WORKERS,
+    ) -> dict:
+        """
+        Awaitable upload_folder_to_s3 for the asyncio parts of the app (e.g. scheduled jobs).
+        The walk and the upload workers run off the event loop; see upload_folder_to_s3.
+        """
+        return await asyncio.to_thread(
+            self.upload_folder_to_s3, local_folder_path, bucket_name, s3_destination_folder, max_workers
+        )
+
 # Example Usage (for testing purposes, normally this service would be injected and used elsewhere):
 # if __name__ == "__main__":
 #     # Configure logging for standalone testing
@@ -1,10 +1,11 @@
 import asyncio
 import logging
+import threading
 from datetime import datetime, timedelta, timezone
 from typing import Callable, Optional, TYPE_CHECKING
-import sys
 
 if TYPE_CHECKING:
+    from app.models.measurement import MeasurementConfigSchema
     from app.services.measurement_service import MeasurementService
 
     # from app.services.measurement_service_test import MeasurementServiceTest
@@ -12,6 +13,12 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Guards creation of the CronScheduler singleton
+_instance_lock = threading.Lock()
+
+# Seconds a reschedule waits for further updates before it is applied
+RESCHEDULE_DEBOUNCE = 0.25
+
 
 class CronScheduler:
     """
@@ -22,46 +29,102 @@ class CronScheduler:
 
     _instance = None
 
+    def __new__(cls):
+        if cls._instance is None:
+            with _instance_lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+        return cls._instance
+
     @classmethod
     def get_instance(cls):
         """
         Get the singleton instance of CronScheduler
         """
-        if cls._instance is None:
-            cls._instance = cls()
-        return cls._instance
+        return cls()
 
     def __init__(self):
         """
-        Private constructor to prevent direct instantiation
+        Initialize the singleton once; later constructions return it unchanged
         """
+        if getattr(self, "_initialized", False):
+            return
+        self._initialized = True
         self.task = None
+        # Strong references to scheduled tasks; the event loop only keeps weak ones
+        self._tasks = set()
+        # Latest requested (minutes_interval, start_time) not yet applied, and the timer that applies it
+        self._desired = None
+        self._pending = None  # type: Optional[asyncio.TimerHandle]
+        # Set on config updates to end the back-off after a failed run early;
+        # created by the job loop so it belongs to the running event loop
+        self._wake = None  # type: Optional[asyncio.Event]
         self.minutes_interval = 0
         self.next_scheduled_date = None
         self.job_callback = None
         self.config_id = None  # Track the current config ID to detect changes
         self.measurement_service = None  # type: Optional["MeasurementService"]
         self.settings_service = None  # type: Optional["SettingsService"]
+        # In-process copy of the measurement config, reused until the
+        # settings endpoint bumps the version
+        self._cached_config = None  # type: Optional["MeasurementConfigSchema"]
+        self._cached_version = -1
+        self._config_version = 0
+
+    def bump_version(self):
+        """
+        Invalidate the cached measurement configuration so the next run re-reads it
+        """
+        self._config_version += 1
+        if self._wake is not None:
+            self._wake.set()
+
+    def cache_config(self, config: "MeasurementConfigSchema"):
+        """
+        Store a freshly loaded measurement configuration for the current version
+        """
+        self._cached_config = config
+        self._cached_version = self._config_version
+
+    async def _get_config(self) -> "MeasurementConfigSchema":
+        """
+        Return the cached measurement configuration, re-querying only when stale
+        """
+        if self._cached_config is None or self._cached_version != self._config_version:
+            version = self._config_version
+            config = await self.settings_service.get_measurement_config()
+            # Only keep it if no update landed while the query was in flight
+            if version == self._config_version:
+                self.cache_config(config)
+            return config
+        return self._cached_config
 
     def register_job(self, job_callback: Callable):
         """
         Register a job function that will be called when the schedule triggers
         """
-        print(
-            f"[CronScheduler] Registering job callback: {job_callback.__name__ if hasattr(job_callback, '__name__') else str(job_callback)}"
+        logger.debug(
+            "Registering job callback: %s", getattr(job_callback, "__name__", job_callback)
         )
         self.job_callback = job_callback
 
     async def _job_wrapper(self):
         """
         Wrapper for the actual job function
+
+        Runs are paced against a monotonic deadline, so the job's own run time
+        doesn't push every following run later
         """
+        loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        next_deadline = loop.time()
         while True:
+            # Only config updates made after this run reads the config should wake it
+            self._wake.clear()
             try:
+                interval_seconds = self.minutes_interval * 60
+                next_deadline += interval_seconds
                 now = datetime.now(timezone.utc)
-                print(
-                    f"[CronScheduler] Running scheduled measurement at: {now.isoformat()}, interval: {self.minutes_interval} minutes"
-                )
                 logger.info(
                     f"Running scheduled measurement at: {now.isoformat()}, interval: {self.minutes_interval} minutes"
                 )
@@ -77,68 +140,62 @@ class CronScheduler:
                     from app.services.measurement_service import MeasurementService
 
                     self.measurement_service = MeasurementService()
-                    print("[CronScheduler] Initializing MeasurementServiceTest")
                     # from app.services.measurement_service_test import MeasurementServiceTest
                     # self.measurement_service = MeasurementServiceTest()
 
                 if self.settings_service is None:
                     # Import here to avoid circular imports
-                    print("[CronScheduler] Initializing SettingsService")
                     from app.services.settings_service import SettingsService
 
                     self.settings_service = SettingsService()
 
-                # Get current measurement configuration
-                print("[CronScheduler] Fetching current measurement configuration")
-                config = await self.settings_service.get_measurement_config()
-                print(f"[CronScheduler] Configuration fetched: {config}")
+                # Get current measurement configuration (cached between updates)
+                config = await self._get_config()
+                logger.debug("Measurement configuration: %s", config)
 
                 # Start the measurement based on the configuration
-                print(f"[CronScheduler] Starting measurement with config")
                 measurement_result = (
                     await self.measurement_service.start_measurement_by_config(config)
                 )
 
                 if measurement_result:
-                    print(
-                        f"[CronScheduler] Scheduled measurement completed successfully: {measurement_result.id}"
-                    )
                     logger.info(
                         f"Scheduled measurement completed successfully: {measurement_result.id}"
                     )
                 else:
-                    print("[CronScheduler] Scheduled measurement failed")
                     logger.error("Scheduled measurement failed")
 
                 # Call the registered callback (legacy support)
                 if self.job_callback:
-                    print("[CronScheduler] Calling registered job callback")
                     await self.job_callback(scheduled=True)
 
-                # Sleep until next run
-                print(
-                    f"[CronScheduler] Next scheduled measurement at: {self.next_scheduled_date.isoformat()}"
+                # Sleep until the next deadline; if the run overran whole intervals,
+                # skip the missed slots instead of firing them back to back
+                remaining = next_deadline - loop.time()
+                if remaining < 0:
+                    missed = int(-remaining // interval_seconds) + 1
+                    logger.warning(
+                        f"Scheduled measurement overran its interval, skipping {missed} slot(s)"
+                    )
+                    next_deadline += missed * interval_seconds
+                    remaining = next_deadline - loop.time()
+                self.next_scheduled_date = datetime.now(timezone.utc) + timedelta(
+                    seconds=remaining
                 )
                 logger.info(
                     f"Next scheduled measurement at: {self.next_scheduled_date.isoformat()}"
                 )
-                print(f"[CronScheduler] Sleeping for {self.minutes_interval} minutes")
-                await asyncio.sleep(self.minutes_interval * 60)
-            except Exception as e:
-                print(
-                    f"[CronScheduler] ERROR in scheduled job: {str(e)}", file=sys.stderr
-                )
-                print(f"[CronScheduler] Exception type: {type(e)}", file=sys.stderr)
-                import traceback
-
-                print(
-                    f"[CronScheduler] Traceback: {traceback.format_exc()}",
-                    file=sys.stderr,
-                )
-                logger.error(f"Error in scheduled job: {str(e)}")
-                # If there's an error, still try to continue after waiting
-                print("[CronScheduler] Waiting 60 seconds before retry")
-                await asyncio.sleep(60)
+                await asyncio.sleep(remaining)
+            except Exception:
+                logger.exception("Error in scheduled job")
+                # If there's an error, still try to continue after waiting, or as soon
+                # as the configuration is updated
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=60)
+                except asyncio.TimeoutError:
+                    pass
+                # The retry starts a fresh cadence from now
+                next_deadline = loop.time()
 
     def set_new_schedule(
         self,
@@ -149,6 +206,10 @@ class CronScheduler:
         """
         Set a new schedule for measurements
 
+        Calls in quick succession are coalesced: only the latest schedule is applied,
+        RESCHEDULE_DEBOUNCE seconds after the last call. Outside a running event loop the
+        schedule is only recorded, and apply_pending_schedule starts it once the loop runs.
+
         Args:
             minutes_interval: The interval between measurements in minutes
             start_time: The time to start the first measurement (defaults to now)
@@ -156,9 +217,6 @@ class CronScheduler:
         """
         # If config_id is provided and matches current config, don't reschedule
         if config_id is not None and config_id == self.config_id:
-            print(
-                f"[CronScheduler] Configuration ID {config_id} already active, not rescheduling"
-            )
             logger.info(
                 f"Configuration ID {config_id} already active, not rescheduling"
             )
@@ -168,36 +226,47 @@ class CronScheduler:
         if config_id is not None:
             self.config_id = config_id
 
-        # Cancel existing task if there is one
-        if self.task and not self.task.done():
-            print("[CronScheduler] Canceling existing measurement schedule")
-            logger.info("Canceling existing measurement schedule")
-            self.task.cancel()
-            self.task = None
-
-        if minutes_interval <= 0:
-            print(
-                f"[CronScheduler] No automatic measurement scheduled - invalid interval: {minutes_interval}"
-            )
-            logger.info("No automatic measurement scheduled - invalid interval")
-            self.next_scheduled_date = None
+        first_run = self._first_run_time(minutes_interval, start_time)
+        # Report the new schedule right away, even while the apply is debounced
+        self.next_scheduled_date = first_run
+        self._desired = (minutes_interval, first_run)
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop to run the schedule task on yet; apply_pending_schedule starts it
+            logger.info("No running event loop, schedule deferred until it is applied")
             return
+        self._pending = loop.call_later(RESCHEDULE_DEBOUNCE, self._apply_pending)
 
-        self.minutes_interval = minutes_interval
+    def _first_run_time(
+        self, minutes_interval: int, start_time: Optional[datetime]
+    ) -> Optional[datetime]:
+        """
+        Resolve when the first measurement of a schedule runs
+
+        Returns:
+            The timezone-aware first run time, or None if the interval disables scheduling
+        """
+        if minutes_interval <= 0:
+            return None
 
         # Use UTC now
         now = datetime.now(timezone.utc)
 
         # If no start time is specified, use now + interval
         if start_time is None:
-            start_time = now + timedelta(minutes=minutes_interval)
-        else:
-            # Ensure start_time is timezone-aware
-            if (
-                start_time.tzinfo is None
-                or start_time.tzinfo.utcoffset(start_time) is None
-            ):
-                start_time = start_time.replace(tzinfo=timezone.utc)
+            return now + timedelta(minutes=minutes_interval)
+
+        # Ensure start_time is timezone-aware
+        if (
+            start_time.tzinfo is None
+            or start_time.tzinfo.utcoffset(start_time) is None
+        ):
+            start_time = start_time.replace(tzinfo=timezone.utc)
 
         # If start time is in the past, calculate the next occurrence
         if start_time < now:
@@ -208,25 +277,57 @@ class CronScheduler:
             start_time = start_time + timedelta(
                 minutes=intervals_passed * minutes_interval
             )
-            print(
-                f"[CronScheduler] Original start time was in the past. Adjusted to next occurrence: {start_time.isoformat()}"
-            )
             logger.info(
                 f"Original start time was in the past. Adjusted to next occurrence: {start_time.isoformat()}"
             )
+        return start_time
 
+    def apply_pending_schedule(self):
+        """
+        Apply the latest requested schedule right away instead of after the debounce.
+        Must be called from the running event loop.
+        """
+        if self._pending is not None:
+            self._pending.cancel()
+        if self._desired is not None:
+            self._apply_pending()
+
+    def _apply_pending(self):
+        """
+        Apply the latest schedule requested through set_new_schedule
+        """
+        self._pending = None
+        minutes_interval, first_run = self._desired
+        self._desired = None
+        self._apply_schedule(minutes_interval, first_run)
+
+    def _apply_schedule(self, minutes_interval: int, start_time: Optional[datetime]):
+        """
+        Replace the running schedule task with one for the given interval and first run time
+        (as resolved by _first_run_time)
+        """
+        # Cancel existing task if there is one
+        if self.task and not self.task.done():
+            logger.info("Canceling existing measurement schedule")
+            self.task.cancel()
+            self.task = None
+
+        if start_time is None:
+            logger.info(
+                f"No automatic measurement scheduled - invalid interval: {minutes_interval}"
+            )
+            self.next_scheduled_date = None
+            return
+
+        self.minutes_interval = minutes_interval
         self.next_scheduled_date = start_time
 
         # Calculate delay until start time
-        delay = (start_time - now).total_seconds()
+        delay = (start_time - datetime.now(timezone.utc)).total_seconds()
         delay = max(0, delay)  # Ensure delay is not negative
-
         async def schedule_task():
             # Wait until the start time
             if delay > 0:
-                print(
-                    f"[CronScheduler] Waiting {delay} seconds until first measurement at {start_time.isoformat()}"
-                )
                 logger.info(
                     f"Waiting {delay} seconds until first measurement at {start_time.isoformat()}"
                 )
@@ -236,12 +337,9 @@ class CronScheduler:
             await self._job_wrapper()
 
         # Create and start the task
-        print(
-            f"[CronScheduler] Scheduled measurements every {minutes_interval} minutes, starting at {start_time.isoformat()}"
-        )
         logger.info(
             f"Scheduled measurements every {minutes_interval} minutes, starting at {start_time.isoformat()}"
         )
-        loop = asyncio.get_event_loop()
-        self.task = loop.create_task(schedule_task())
-        print(f"[CronScheduler] Task created: {self.task}")
+        self.task = asyncio.get_running_loop().create_task(schedule_task(), name=f"cron-{self.config_id}")
+        self._tasks.add(self.task)
+        self.task.add_done_callback(self._tasks.discard)
@@ -1,24 +1,250 @@
 import os
+import stat
+import asyncio
+import functools
 import logging
-from typing import Optional, Dict, List, Any, Union
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Dict, List, Any, Tuple, Union
 import io
 
+import google_auth_httplib2
+import httplib2
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload, MediaIoBaseDownload
+from googleapiclient.http import HttpRequest, MediaFileUpload, MediaIoBaseUpload, MediaIoBaseDownload
 
 from app.config.settings import get_google_drive_settings
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+# Socket timeout in seconds for Drive connections, so a dead keep-alive socket can't hang a worker
+HTTP_TIMEOUT = 30
+
+# Blocking googleapiclient calls made from async code run here; shared by every service instance
+_drive_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="gdrive")
+
+# Bytes fetched per request when downloading media
+DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Uploads smaller than this go out as one multipart request instead of a resumable session
+RESUMABLE_UPLOAD_THRESHOLD = 5 * 1024 * 1024
+# Bytes sent per request in a resumable upload (must be a multiple of 256 KiB)
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Number of (parent, name) -> folder ID entries kept by the folder cache
+FOLDER_CACHE_SIZE = 1024
+
+
+# Transient failures worth retrying; a 403 only when Drive reports it as rate limiting
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+RATE_LIMIT_REASONS = frozenset({'rateLimitExceeded', 'userRateLimitExceeded'})
+MAX_RETRY_ATTEMPTS = 6
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 60
+RETRY_JITTER = 0.5
+
+
+def _is_retryable(error: HttpError) -> bool:
+    """
+    Check whether a Drive API error is transient and the call should be retried
+    """
+    status = error.resp.status
+    if status in RETRYABLE_STATUSES:
+        return True
+    if status == 403:
+        details = getattr(error, 'error_details', None)
+        if isinstance(details, list):
+            return any(
+                isinstance(detail, dict) and detail.get('reason') in RATE_LIMIT_REASONS
+                for detail in details
+            )
+    return False
+
+
+def _is_not_found(error: HttpError) -> bool:
+    """
+    Check whether a Drive API error says the file or folder doesn't exist
+    """
+    return error.resp.status == 404
+
+
+def _retry_delay(error: HttpError, attempt: int) -> float:
+    """
+    Seconds to wait before the next attempt: Retry-After if the server sent one,
+    otherwise capped exponential backoff with jitter
+    """
+    retry_after = error.resp.get('retry-after')
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass  # HTTP-date form, fall back to backoff
+    return min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt) + random.random() * RETRY_JITTER
+
+
+def _on_event_loop() -> bool:
+    """
+    Check whether the calling thread is running an asyncio event loop
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def retry_with_backoff(func: Callable) -> Callable:
+    """
+    Retry a Drive API call on transient HttpErrors (rate limits, timeouts and 5xx)
+
+    Non-retryable errors, and the last failure once MAX_RETRY_ATTEMPTS is reached,
+    are raised to the caller unchanged. The back-off sleeps block the thread, so calls
+    made directly on the event loop are not retried; use the *_async methods, which run
+    in the executor.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        for attempt in range(MAX_RETRY_ATTEMPTS):
+            try:
+                return func(*args, **kwargs)
+            except HttpError as e:
+                if attempt == MAX_RETRY_ATTEMPTS - 1 or not _is_retryable(e) or _on_event_loop():
+                    raise
+                delay = _retry_delay(e, attempt)
+                logger.warning(
+                    f"Google Drive API call failed with status {e.resp.status}, "
+                    f"retrying in {delay:.1f}s (attempt {attempt + 1}/{MAX_RETRY_ATTEMPTS})"
+                )
+                time.sleep(delay)
+    return wrapper
+
+
+# Longest file or folder name Drive accepts
+MAX_NAME_LENGTH = 32767
+
+
+def _is_valid_folder_name(folder_name: str) -> bool:
+    """
+    Check that a single folder name is usable: non-empty, within Drive's length limit
+    and not itself a path
+    """
+    if not folder_name or len(folder_name) > MAX_NAME_LENGTH:
+        logger.error(f"Invalid folder name length ({len(folder_name or '')} characters)")
+        return False
+    if '/' in folder_name:
+        logger.error(f"Folder name must be a single path component: '{folder_name}'")
+        return False
+    return True
+
+
+def _escape_query_value(value: str) -> str:
+    """
+    Escape a value for use inside a single-quoted Drive query string
+    """
+    return value.replace('\\', '\\\\').replace("'", "\\'")
+
+class FolderIdCache:
+    """
+    Thread-safe LRU cache of folder IDs keyed by (parent_id, folder_name)
+
+    A parent_id of None stands for a top-level lookup, matching find_folder without a parent.
+    """
+    def __init__(self, max_size: int = FOLDER_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[Optional[str], str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, parent_id: Optional[str], folder_name: str) -> Optional[str]:
+        key = (parent_id, folder_name)
+        with self._lock:
+            folder_id = self._entries.get(key)
+            if folder_id is not None:
+                self._entries.move_to_end(key)
+            return folder_id
+
+    def put(self, parent_id: Optional[str], folder_name: str, folder_id: str) -> None:
+        key = (parent_id, folder_name)
+        with self._lock:
+            self._entries[key] = folder_id
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def path_of(self, folder_id: str) -> Optional[List[str]]:
+        """
+        Folder names from the top of the path down to a cached folder
+
+        Returns:
+            The folder names, or None if some level of the path isn't cached
+        """
+        with self._lock:
+            keys_by_id = {value: key for key, value in self._entries.items()}
+        names: List[str] = []
+        current_id: Optional[str] = folder_id
+        while current_id is not None:
+            key = keys_by_id.get(current_id)
+            if key is None or len(names) > len(keys_by_id):
+                return None
+            current_id, folder_name = key
+            names.append(folder_name)
+        return names[::-1]
+
+    def invalidate(self, folder_id: str) -> None:
+        """
+        Drop a folder and every cached folder below it
+        """
+        with self._lock:
+            removed = {folder_id}
+            while True:
+                stale = [
+                    key for key, value in self._entries.items()
+                    if value in removed or key[0] in removed
+                ]
+                if not stale:
+                    break
+                for key in stale:
+                    removed.add(self._entries.pop(key))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Folders are looked up again for every measurement, so the cache is shared by all instances
+_folder_cache = FolderIdCache()
+
+# Guards creation of the GoogleDriveService singleton
+_instance_lock = threading.Lock()
+
+
 class GoogleDriveService:
     """
     Service for interacting with Google Drive using a service account
     """
     # The scope for the Google Drive API
     SCOPES = ['https://www.googleapis.com/auth/drive']
+
+    _instance = None
+
+    @classmethod
+    def get_instance(cls) -> "GoogleDriveService":
+        """
+        Get the process-wide service using the configured credentials, so the Drive client
+        and its connections are built once and reused
+        """
+        if cls._instance is None:
+            with _instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
     
     def __init__(self, credentials_path: str = None):
         """
@@ -33,7 +259,15 @@ class GoogleDriveService:
             drive_settings.credentials_path
         )
         self.default_upload_path = drive_settings.default_upload_path
+        self.max_upload_concurrency = drive_settings.max_upload_concurrency
         self.service = None
+        self.credentials = None
+        self._executor = _drive_executor
+        self._folder_cache = _folder_cache
+        # httplib2.Http is not thread-safe, so each executor thread gets its own
+        self._local = threading.local()
+        # Serializes building the credentials and client; API calls themselves take no lock
+        self._auth_lock = threading.RLock()
     
     def authenticate(self) -> bool:
         """
@@ -43,17 +277,63 @@ class GoogleDriveService:
             True if authentication was successful, False otherwise
         """
         try:
-            credentials = service_account.Credentials.from_service_account_file(
-                self.credentials_path, scopes=self.SCOPES
-            )
-            
-            self.service = build('drive', 'v3', credentials=credentials)
+            with self._auth_lock:
+                credentials = service_account.Credentials.from_service_account_file(
+                    self.credentials_path, scopes=self.SCOPES
+                )
+
+                self.credentials = credentials
+                # The discovery document bundled with the client library is used as is,
+                # instead of being fetched and cached on every build
+                self.service = build(
+                    'drive', 'v3',
+                    credentials=credentials,
+                    requestBuilder=self._build_request,
+                    cache_discovery=False,
+                    static_discovery=True,
+                )
             logger.info("Successfully authenticated with Google Drive API")
             return True
         except Exception as e:
             logger.error(f"Error authenticating with Google Drive API: {e}")
             return False
     
+    def _thread_http(self) -> google_auth_httplib2.AuthorizedHttp:
+        """
+        Get the authorized HTTP client of the calling thread, creating it on first use
+        """
+        http = getattr(self._local, 'http', None)
+        # Rebuild after a re-authentication so requests carry the new credentials
+        if http is None or http.credentials is not self.credentials:
+            http = google_auth_httplib2.AuthorizedHttp(
+                self.credentials, http=httplib2.Http(timeout=HTTP_TIMEOUT)
+            )
+            self._local.http = http
+        return http
+
+    def _build_request(self, http, *args, **kwargs) -> HttpRequest:
+        """
+        Request builder for the Drive client that sends every request over the calling
+        thread's own HTTP client instead of the one shared by the service object
+        """
+        return HttpRequest(self._thread_http(), *args, **kwargs)
+
+    @staticmethod
+    @retry_with_backoff
+    def _execute(request: HttpRequest) -> Any:
+        """
+        Execute a Drive API request, retrying transient failures
+        """
+        return request.execute()
+
+    @staticmethod
+    @retry_with_backoff
+    def _next_chunk(downloader: MediaIoBaseDownload) -> Tuple[Any, bool]:
+        """
+        Download the next chunk of a media download, retrying transient failures
+        """
+        return downloader.next_chunk()
+
     def ensure_authenticated(self) -> bool:
         """
         Ensure the service is authenticated before making API calls
@@ -61,9 +341,13 @@ class GoogleDriveService:
         Returns:
             True if authenticated, False otherwise
         """
-        if self.service is None:
+        if self.service is not None:
+            return True
+        with self._auth_lock:
+            # Another thread may have authenticated while this one waited
+            if self.service is not None:
+                return True
             return self.authenticate()
-        return True
     
     def create_folder(self, folder_name: str, parent_id: Optional[str] = None) -> Optional[str]:
         """
@@ -78,6 +362,9 @@ class GoogleDriveService:
         """
         if not self.ensure_authenticated():
             return None
+
+        if not _is_valid_folder_name(folder_name):
+            return None
         
         folder_metadata = {
             'name': folder_name,
@@ -88,13 +375,15 @@ class GoogleDriveService:
             folder_metadata['parents'] = [parent_id]
         
         try:
-            folder = self.service.files().create(
+            folder = self._execute(self.service.files().create(
                 body=folder_metadata,
                 fields='id'
-            ).execute()
+            ))
             
             folder_id = folder.get('id')
             logger.info(f"Created folder '{folder_name}' with ID: {folder_id}")
+            if folder_id:
+                self._folder_cache.put(parent_id, folder_name, folder_id)
             return folder_id
         except HttpError as e:
             logger.error(f"Error creating folder in Google Drive: {e}")
@@ -113,19 +402,22 @@ class GoogleDriveService:
         """
         if not self.ensure_authenticated():
             return None
+
+        if not _is_valid_folder_name(folder_name):
+            return None
         
-        query = f"mimeType='application/vnd.google-apps.folder' and name='{folder_name}' and trashed=false"
+        query = f"mimeType='{FOLDER_MIME_TYPE}' and name='{_escape_query_value(folder_name)}' and trashed=false"
         
         if parent_id:
             query += f" and '{parent_id}' in parents"
         
         try:
-            results = self.service.files().list(
+            results = self._execute(self.service.files().list(
                 q=query,
                 spaces='drive',
-                fields='files(id, name)',
+                fields='files(id)',
                 pageSize=1
-            ).execute()
+            ))
             
             items = results.get('files', [])
             
@@ -151,13 +443,78 @@ class GoogleDriveService:
         Returns:
             The ID of the found or created folder, or None if operation failed
         """
+        folder_id = self._folder_cache.get(parent_id, folder_name)
+        if folder_id:
+            return folder_id
+
         folder_id = self.find_folder(folder_name, parent_id)
         
         if folder_id:
+            self._folder_cache.put(parent_id, folder_name, folder_id)
             return folder_id
         
         return self.create_folder(folder_name, parent_id)
     
+    def _resolve_existing_path(self, folders: List[str]) -> List[str]:
+        """
+        Resolve the longest existing prefix of a folder path with a single list query
+
+        Args:
+            folders: Folder names from the top of the path down
+
+        Returns:
+            The IDs of the existing folders from the top down, one per resolved path component
+        """
+        names = " or ".join(f"name='{_escape_query_value(name)}'" for name in set(folders))
+        query = f"mimeType='{FOLDER_MIME_TYPE}' and trashed=false and ({names})"
+
+        candidates: List[Dict[str, Any]] = []
+        page_token = None
+        while True:
+            results = self._execute(self.service.files().list(
+                q=query,
+                spaces='drive',
+                fields='nextPageToken, files(id, name, parents)',
+                pageSize=1000,
+                pageToken=page_token,
+            ))
+            candidates.extend(results.get('files', []))
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+
+        # Walk down the path: the top folder may be anywhere (as with find_folder without a
+        # parent), every next folder must be a child of the previous one
+        folder_ids: List[str] = []
+        for folder_name in folders:
+            current_id = folder_ids[-1] if folder_ids else None
+            match = next(
+                (
+                    item for item in candidates
+                    if item.get('name') == folder_name
+                    and (current_id is None or current_id in item.get('parents', []))
+                ),
+                None,
+            )
+            if match is None:
+                break
+            folder_ids.append(match['id'])
+        return folder_ids
+
+    def _cached_path(self, folders: List[str]) -> Optional[str]:
+        """
+        Look up a whole folder path in the folder cache
+
+        Returns:
+            The ID of the last folder if every level is cached, None otherwise
+        """
+        current_id = None
+        for folder_name in folders:
+            current_id = self._folder_cache.get(current_id, folder_name)
+            if current_id is None:
+                return None
+        return current_id
+
     def create_folder_path(self, path: str) -> Optional[str]:
         """
         Create a path of folders in Google Drive (e.g., '/test/files/')
@@ -176,15 +533,29 @@ class GoogleDriveService:
         if not path:
             return None  # Root folder, no need to create anything
             
-        folders = path.split('/')
-        
-        current_parent_id = None  # Start from the root
-        
-        for folder_name in folders:
-            if not folder_name:
-                continue  # Skip empty folder names
-                
-            folder_id = self.find_or_create_folder(folder_name, current_parent_id)
+        folders = [folder_name for folder_name in path.split('/') if folder_name]  # Skip empty folder names
+        if not all(_is_valid_folder_name(folder_name) for folder_name in folders):
+            return None
+
+        folder_id = self._cached_path(folders)
+        if folder_id:
+            return folder_id
+
+        # One request resolves every existing level; only the missing tail is created
+        try:
+            resolved_ids = self._resolve_existing_path(folders)
+        except HttpError as e:
+            logger.error(f"Error resolving folder path '{path}' in Google Drive: {e}")
+            return None
+
+        current_parent_id = None
+        for folder_name, folder_id in zip(folders, resolved_ids):
+            self._folder_cache.put(current_parent_id, folder_name, folder_id)
+            current_parent_id = folder_id
+
+        for folder_name in folders[len(resolved_ids):]:
+            # Each level is new, so it can be created without looking it up first
+            folder_id = self.create_folder(folder_name, current_parent_id)
             if not folder_id:
                 logger.error(f"Failed to create folder '{folder_name}' in path '{path}'")
                 return None
@@ -193,14 +564,33 @@ class GoogleDriveService:
         
         return current_parent_id
     
+    def _refresh_folder(self, folder_id: str) -> Optional[str]:
+        """
+        Drop a folder Drive no longer knows from the folder cache and resolve its path again
+
+        Args:
+            folder_id: Cached folder ID that Drive answered 404 for
+
+        Returns:
+            The folder's current ID, or None if its path wasn't cached or can't be resolved
+        """
+        folders = self._folder_cache.path_of(folder_id)
+        self._folder_cache.invalidate(folder_id)
+        if not folders:
+            return None
+        path = '/'.join(folders)
+        logger.warning(f"Folder '{path}' ({folder_id}) not found in Google Drive, resolving it again")
+        return self.create_folder_path(path)
+
     def upload_file(
         self, 
         file_content: Union[str, bytes, io.IOBase],
         file_name: str,
         parent_id: Optional[str] = None,
         mime_type: Optional[str] = None,
-        resumable: bool = True,
-        is_path: bool = False
+        resumable: Optional[bool] = None,
+        is_path: bool = False,
+        chunksize: int = UPLOAD_CHUNK_SIZE
     ) -> Optional[str]:
         """
         Upload a file to Google Drive
@@ -210,8 +600,10 @@ class GoogleDriveService:
             file_name: Name to use for the file in Google Drive
             parent_id: ID of the parent folder. If None, file will be uploaded to root
             mime_type: MIME type of the file. If None, it will be guessed
-            resumable: Whether to use resumable upload (recommended for files > 5MB)
+            resumable: Whether to use resumable upload. If None, content under 5MB is sent in a
+                       single request and anything larger (or of unknown size) is resumable
             is_path: Whether file_content is a path to a file (True) or the actual content (False)
+            chunksize: Bytes sent per request in a resumable upload
             
         Returns:
             The ID of the uploaded file, or None if upload failed
@@ -226,13 +618,21 @@ class GoogleDriveService:
         
         try:
             if is_path:
-                if not os.path.exists(file_content) or not os.path.isfile(file_content):
+                try:
+                    file_stat = os.stat(file_content)
+                except OSError:
+                    file_stat = None
+                if file_stat is None or not stat.S_ISREG(file_stat.st_mode):
                     logger.error(f"Local file not found or is not a file: {file_content}")
                     return None
+
+                if resumable is None:
+                    resumable = file_stat.st_size >= RESUMABLE_UPLOAD_THRESHOLD
                     
                 media = MediaFileUpload(
                     file_content,
                     mimetype=mime_type,
+                    chunksize=chunksize,
                     resumable=resumable
                 )
             else:
@@ -242,18 +642,40 @@ class GoogleDriveService:
                 
                 if isinstance(file_content, bytes):
                     file_content = io.BytesIO(file_content)
+
+                if resumable is None:
+                    if isinstance(file_content, io.BytesIO):
+                        size = file_content.getbuffer().nbytes - file_content.tell()
+                        resumable = size >= RESUMABLE_UPLOAD_THRESHOLD
+                    else:
+                        resumable = True  # Size unknown without reading the stream
                 
                 media = MediaIoBaseUpload(
                     file_content,
                     mimetype=mime_type,
+                    chunksize=chunksize,
                     resumable=resumable
                 )
             
-            file = self.service.files().create(
-                body=file_metadata,
-                media_body=media,
-                fields='id'
-            ).execute()
+            try:
+                file = self._execute(self.service.files().create(
+                    body=file_metadata,
+                    media_body=media,
+                    fields='id'
+                ))
+            except HttpError as e:
+                if not (parent_id and _is_not_found(e)):
+                    raise
+                # The cached parent may have been deleted or moved outside the app
+                parent_id = self._refresh_folder(parent_id)
+                if not parent_id:
+                    raise
+                file_metadata['parents'] = [parent_id]
+                file = self._execute(self.service.files().create(
+                    body=file_metadata,
+                    media_body=media,
+                    fields='id'
+                ))
             
             file_id = file.get('id')
             logger.info(f"Uploaded file '{file_name}' with ID: {file_id}")
@@ -293,23 +715,143 @@ class GoogleDriveService:
             logger.error(f"Failed to create or find folder path: {folder_path}")
             return None
         
-        # Calculate file size for resumable upload if it's a file path
-        if is_path and isinstance(file_content, str):
-            file_size = os.path.getsize(file_content)
-            use_resumable = file_size > 5 * 1024 * 1024  # 5MB
-        else:
-            use_resumable = True  # Default to resumable for non-file paths
-        
-        # Upload the file to the folder
+        # Upload the file to the folder; upload_file picks resumable or single-request by size
         return self.upload_file(
             file_content=file_content,
             file_name=file_name,
             parent_id=folder_id,
             mime_type=mime_type,
-            resumable=use_resumable,
             is_path=is_path
         )
         
+    async def ensure_authenticated_async(self) -> bool:
+        """
+        Ensure the service is authenticated without blocking the event loop
+
+        Returns:
+            True if authenticated, False otherwise
+        """
+        if self.service is not None:
+            return True
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.ensure_authenticated)
+
+    async def create_folder_path_async(self, path: str) -> Optional[str]:
+        """
+        Create a path of folders in Google Drive without blocking the event loop
+
+        Args:
+            Same as create_folder_path
+
+        Returns:
+            The ID of the last folder in the path, or None if creation failed
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.create_folder_path, path)
+
+    async def upload_file_async(
+        self,
+        file_content: Union[str, bytes, io.IOBase],
+        file_name: str,
+        parent_id: Optional[str] = None,
+        mime_type: Optional[str] = None,
+        resumable: Optional[bool] = None,
+        is_path: bool = False
+    ) -> Optional[str]:
+        """
+        Upload a file to Google Drive without blocking the event loop
+
+        Args:
+            Same as upload_file
+
+        Returns:
+            The ID of the uploaded file, or None if upload failed
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(
+            self.upload_file,
+            file_content=file_content,
+            file_name=file_name,
+            parent_id=parent_id,
+            mime_type=mime_type,
+            resumable=resumable,
+            is_path=is_path
+        ))
+
+    async def upload_files_to_path_async(
+        self,
+        files: List[Dict[str, Any]],
+        folder_path: str = None,
+        max_concurrency: Optional[int] = None,
+        parent_id: Optional[str] = None
+    ) -> List[Optional[str]]:
+        """
+        Upload several files to one path in Google Drive concurrently
+
+        Args:
+            files: Keyword arguments for each upload: file_content, file_name and optionally
+                   mime_type and is_path
+            folder_path: Path where the files should be uploaded (e.g., '/test/files')
+            max_concurrency: Maximum number of uploads in flight at once; defaults to the
+                             max_upload_concurrency setting
+            parent_id: ID of the target folder, if already known; folder_path is then ignored
+
+        Returns:
+            The IDs of the uploaded files in the order given, None for each upload that failed
+        """
+        if folder_path is None:
+            folder_path = self.default_upload_path
+
+        # Resolve the folder once instead of once per file
+        folder_id = parent_id or await self.create_folder_path_async(folder_path)
+        if not folder_id:
+            logger.error(f"Failed to create or find folder path: {folder_path}")
+            return [None] * len(files)
+
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_upload_concurrency)
+
+        async def upload(file: Dict[str, Any]) -> Optional[str]:
+            async with semaphore:
+                return await self.upload_file_async(parent_id=folder_id, **file)
+
+        return list(await asyncio.gather(*(upload(file) for file in files)))
+
+    async def download_file_async(
+        self,
+        file_id: str,
+        destination_path: Optional[str] = None
+    ) -> Optional[Union[bytes, str]]:
+        """
+        Download a file from Google Drive without blocking the event loop
+
+        Args:
+            Same as download_file
+
+        Returns:
+            Same as download_file
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self.download_file, file_id, destination_path
+        )
+
+    def _download_media(self, request: HttpRequest, fd: io.IOBase) -> None:
+        """
+        Download a media request chunk by chunk into a writable file object
+        """
+        downloader = MediaIoBaseDownload(fd, request, chunksize=DOWNLOAD_CHUNK_SIZE)
+        log_progress = logger.isEnabledFor(logging.INFO)
+        last_percent = -1
+        done = False
+        while not done:
+            status, done = self._next_chunk(downloader)
+            if log_progress:
+                # Log in 5% steps rather than once per chunk
+                percent = int(status.progress() * 20) * 5
+                if percent != last_percent:
+                    logger.info(f"Download progress: {percent}%")
+                    last_percent = percent
+
     def download_file(
         self, 
         file_id: str, 
@@ -331,33 +873,27 @@ class GoogleDriveService:
             return None
             
         try:
-            # Get file metadata to determine filename if not saving directly
-            file_metadata = self.service.files().get(fileId=file_id, fields="name,mimeType").execute()
-            file_name = file_metadata.get("name", "downloaded_file")
-            mime_type = file_metadata.get("mimeType", "application/octet-stream")
-            
             # Download the file content
             request = self.service.files().get_media(fileId=file_id)
-            file_content = io.BytesIO()
-            
-            downloader = MediaIoBaseDownload(file_content, request)
-            done = False
-            while not done:
-                status, done = downloader.next_chunk()
-                logger.info(f"Download progress: {int(status.progress() * 100)}%")
-                
-            file_content.seek(0)
-            
-            # If destination path is provided, save the file
+
+            # If destination path is provided, stream the chunks straight into the file
             if destination_path:
                 os.makedirs(os.path.dirname(os.path.abspath(destination_path)), exist_ok=True)
-                
-                with open(destination_path, "wb") as f:
-                    f.write(file_content.read())
+
+                try:
+                    with open(destination_path, "wb") as f:
+                        self._download_media(request, f)
+                except Exception:
+                    # Don't leave a truncated file behind
+                    if os.path.exists(destination_path):
+                        os.remove(destination_path)
+                    raise
                 logger.info(f"File saved to {destination_path}")
                 return destination_path
-            
+
             # Otherwise return the file content as bytes
+            file_content = io.BytesIO()
+            self._download_media(request, file_content)
             return file_content.getvalue()
             
         except HttpError as e:
@@ -366,25 +902,3 @@ class GoogleDriveService:
         except Exception as e:
             logger.error(f"Unexpected error downloading file: {e}")
             return None
-            
-    def get_file_metadata(self, file_id: str) -> Optional[Dict[str, Any]]:
-        """
-        Get metadata for a file in Google Drive
-        
-        Args:
-            file_id: The ID of the file
-            
-        Returns:
-            A dictionary containing the file metadata, or None if retrieval failed
-        """
-        if not self.ensure_authenticated():
-            return None
-            
-        try:
-            return self.service.files().get(
-                fileId=file_id, 
-                fields="id,name,mimeType,size,createdTime,modifiedTime,webViewLink"
-            ).execute()
-        except HttpError as e:
-            logger.error(f"Error getting file metadata from Google Drive: {e}")
-            return None
\ No newline at end of file
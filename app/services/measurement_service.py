@@ -1,8 +1,10 @@
-import os
 import io
+import asyncio
 import logging
-from datetime import datetime
-from typing import List, Tuple, Optional
+from datetime import datetime, timezone
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator, List, Tuple, Optional
 
 from app.models.measurement import MeasurementInfoOrm, MeasurementInfoSchema, MeasurementConfigSchema
 from app.models.measurement_file import MeasurementFileOrm, MeasurementFileSchema
@@ -14,6 +16,42 @@ from app.services.google_drive_service import GoogleDriveService
 
 logger = logging.getLogger(__name__)
 
+# Placeholder data uploaded for every acoustic sensor until the real system is wired in
+AE_MOCK_FILE = "ae/ae.mock.txt"
+
+# Captures are stored as lossless PNG; zlib level 1 costs a fraction of the default
+# level's CPU for somewhat larger files
+CAPTURE_PNG_COMPRESS_LEVEL = 1
+
+
+@lru_cache(maxsize=1)
+def _ae_mock_bytes() -> bytes:
+    """
+    Read the acoustic emission mock data once per process
+    """
+    with open(AE_MOCK_FILE, 'rb') as f:
+        return f.read()
+
+
+def _file_timestamp(dt: datetime) -> str:
+    """
+    Format a timestamp for file names as YYYYMMDDHHMMSS, without going through strftime
+    """
+    return f"{dt.year:04d}{dt.month:02d}{dt.day:02d}{dt.hour:02d}{dt.minute:02d}{dt.second:02d}"
+
+
+@asynccontextmanager
+async def _camera_session(camera_id: str) -> AsyncIterator[AravisCameraService]:
+    """
+    Yield a camera service that is always disconnected on exit, whatever the outcome.
+    Connecting is left to the caller so it can overlap with other work.
+    """
+    camera = AravisCameraService(camera_id=camera_id)
+    try:
+        yield camera
+    finally:
+        await asyncio.to_thread(camera.disconnect)
+
 
 class MeasurementService:
     """
@@ -29,63 +67,59 @@ class MeasurementService:
         """
         return await self.measurement_repo.save_new_measurement(measurement)
 
-    async def get_measurement(self, measurement_id: int) -> Optional[MeasurementInfoOrm]:
+    async def get_measurement(self, measurement_id: int, with_files: bool = True) -> Optional[MeasurementInfoOrm]:
         """
-        Get a measurement by ID
+        Get a measurement by ID, with its files eager loaded if with_files is set
         """
-        return await self.measurement_repo.get_measurement_by_id(measurement_id)
-        
+        return await self.measurement_repo.get_measurement_by_id(measurement_id, with_files=with_files)
+
     async def get_measurement_with_files(self, measurement_id: int) -> Optional[MeasurementInfoOrm]:
         """
         Get a measurement by ID with files eager loaded
-        
+
         Args:
             measurement_id: ID of the measurement
-            
+
         Returns:
             MeasurementInfoOrm with files loaded or None if not found
         """
-        measurement = await self.measurement_repo.get_measurement_by_id(measurement_id)
-        # The relationship is configured with lazy="selectin", so files should be loaded
-        return measurement
+        return await self.get_measurement(measurement_id, with_files=True)
 
-    async def get_latest_measurement_info(self) -> List[MeasurementInfoOrm]:
+    async def get_latest_measurement_info(self, with_files: bool = True) -> List[MeasurementInfoOrm]:
         """
-        Get the latest measurements
+        Get the latest measurements, with their files eager loaded if with_files is set
         """
-        return await self.measurement_repo.get_latest_measurement_info()
-        
+        return await self.measurement_repo.get_latest_measurement_info(with_files=with_files)
+
     async def get_latest_measurements_with_files(self) -> List[MeasurementInfoOrm]:
         """
         Get the latest measurements with files eager loaded
-        
+
         Returns:
             List of MeasurementInfoOrm with files loaded
         """
-        measurements = await self.measurement_repo.get_latest_measurement_info()
-        # The relationship is configured with lazy="selectin", so files should be loaded
-        return measurements
+        return await self.get_latest_measurement_info(with_files=True)
 
-    async def get_measurement_history(self, start_date: datetime, end_date: datetime) -> List[MeasurementInfoOrm]:
+    async def get_measurement_history(
+        self, start_date: datetime, end_date: datetime, with_files: bool = True
+    ) -> List[MeasurementInfoOrm]:
         """
-        Get measurement history within a date range
+        Get measurement history within a date range, with files eager loaded if with_files is set
         """
-        return await self.measurement_repo.get_measurement_history(start_date, end_date)
-        
+        return await self.measurement_repo.get_measurement_history(start_date, end_date, with_files=with_files)
+
     async def get_measurement_history_with_files(self, start_date: datetime, end_date: datetime) -> List[MeasurementInfoOrm]:
         """
         Get measurement history within a date range with files eager loaded
-        
+
         Args:
             start_date: Beginning of the date range
             end_date: End of the date range
-            
+
         Returns:
             List of MeasurementInfoOrm with files loaded
         """
-        measurements = await self.measurement_repo.get_measurement_history(start_date, end_date)
-        # The relationship is configured with lazy="selectin", so files should be loaded
-        return measurements
+        return await self.get_measurement_history(start_date, end_date, with_files=True)
 
     async def delete_measurement(self, measurement: MeasurementInfoOrm) -> None:
         """
@@ -99,7 +133,42 @@ class MeasurementService:
         """
         return await self.measurement_repo.get_paged_measurements(pageable)
 
-    async def start_rgb_measurement(self, measurement_id: int, date_time: datetime, duration: int):
+    async def _resolve_measurement_folder(
+        self, measurement_id: int, folder_id: Optional[str] = None
+    ) -> Tuple[Optional[str], Optional[dict]]:
+        """
+        Find or create the Google Drive folder of a measurement
+
+        Args:
+            measurement_id: ID of the measurement
+            folder_id: Folder already resolved by the caller; returned as is
+
+        Returns:
+            (folder ID, None) on success, or (None, error status) on failure
+        """
+        if folder_id is not None:
+            return folder_id, None
+
+        drive_service = GoogleDriveService.get_instance()
+        if not await drive_service.ensure_authenticated_async():
+            logger.error("Failed to authenticate with Google Drive")
+            return None, {"status": "error", "message": "Failed to authenticate with Google Drive"}
+
+        folder_id = await drive_service.create_folder_path_async(f"/measurements/{measurement_id}")
+        if not folder_id:
+            logger.error(f"Failed to create folder for measurement {measurement_id}")
+            return None, {"status": "error", "message": "Failed to create folder in Google Drive"}
+        return folder_id, None
+
+    async def start_rgb_measurement(
+        self,
+        measurement_id: int,
+        date_time: datetime,
+        duration: int,
+        folder_id: Optional[str] = None,
+        now: Optional[datetime] = None,
+        timestamp: Optional[str] = None
+    ):
         """
         Start RGB camera measurement
 
@@ -107,58 +176,57 @@ class MeasurementService:
             measurement_id: ID of the measurement
             date_time: Timestamp for the measurement
             duration: Duration of the measurement in seconds
+            folder_id: Drive folder of the measurement, if already resolved by the caller
+            now: Timestamp for the file records, shared by every component of a measurement
+            timestamp: File name timestamp, if already formatted by the caller
 
         Returns:
             Status of the measurement
         """
         try:
-            # Create RGB camera service
-            rgb_camera = AravisCameraService(camera_id="Basler-21876874")
-            if not rgb_camera.connect():
-                logger.error("Failed to connect to RGB camera")
-                return {"status": "error", "message": "Failed to connect to RGB camera"}
-
-            # Capture image as blob
-            timestamp = date_time.strftime("%Y%m%d%H%M%S")
+            timestamp = timestamp or _file_timestamp(date_time)
             rgb_filename = f"RGB_{timestamp}.png"
             format = "PNG"
 
-            # Get image as blob
-            image_blob = rgb_camera.get_image_blob(format=format)
-            if not image_blob:
+            # The camera is released when the block exits; it isn't needed for the upload
+            async with _camera_session("Basler-21876874") as rgb_camera:
+                # Camera warm-up and Drive folder resolution touch disjoint resources,
+                # so run them side by side
+                connected, (folder_id, error) = await asyncio.gather(
+                    asyncio.to_thread(rgb_camera.connect),
+                    self._resolve_measurement_folder(measurement_id, folder_id)
+                )
+                if not connected:
+                    logger.error("Failed to connect to RGB camera")
+                    return {"status": "error", "message": "Failed to connect to RGB camera"}
+                if error:
+                    return error
+
+                # Get image as an in-memory stream
+                image_stream = await rgb_camera.get_image_stream_async(
+                    format=format, compress_level=CAPTURE_PNG_COMPRESS_LEVEL
+                )
+
+            if image_stream is None:
                 logger.error("Failed to capture image from RGB camera")
-                rgb_camera.disconnect()
                 return {"status": "error", "message": "Failed to capture image from RGB camera"}
 
             # Upload to Google Drive
-            drive_service = GoogleDriveService()
-            if not drive_service.authenticate():
-                logger.error("Failed to authenticate with Google Drive")
-                rgb_camera.disconnect()
-                return {"status": "error", "message": "Failed to authenticate with Google Drive"}
-
-            folder_path = f"/measurements/{measurement_id}"
-            folder_id = drive_service.create_folder_path(folder_path)
-            if not folder_id:
-                logger.error(f"Failed to create folder for measurement {measurement_id}")
-                rgb_camera.disconnect()
-                return {"status": "error", "message": "Failed to create folder in Google Drive"}
-
-            file_id = drive_service.upload_file_to_path(
-                file_content=io.BytesIO(image_blob),
+            drive_service = GoogleDriveService.get_instance()
+            file_id = await drive_service.upload_file_async(
+                file_content=image_stream,
                 file_name=rgb_filename,
-                folder_path=folder_path,
+                parent_id=folder_id,
                 mime_type=f"image/{format.lower()}",
                 is_path=False
             )
 
             if not file_id:
                 logger.error("Failed to upload RGB image to Google Drive")
-                rgb_camera.disconnect()
                 return {"status": "error", "message": "Failed to upload image to Google Drive"}
 
             # Save file reference to the database with timestamps
-            now = datetime.utcnow()
+            now = now or datetime.now(timezone.utc)
             file = MeasurementFileOrm(
                 name=rgb_filename,
                 google_drive_file_id=file_id,
@@ -168,72 +236,77 @@ class MeasurementService:
             )
             await self.file_repo.save(file)
 
-            rgb_camera.disconnect()
             return {"status": "success", "message": f"RGB measurement {measurement_id} completed successfully", "file_id": file_id}
 
         except Exception as e:
             logger.error(f"Error during RGB measurement: {e}")
             return {"status": "error", "message": f"Error during RGB measurement: {str(e)}"}
 
-    async def start_multispectral_measurement(self, measurement_id: int, date_time: datetime):
+    async def start_multispectral_measurement(
+        self,
+        measurement_id: int,
+        date_time: datetime,
+        folder_id: Optional[str] = None,
+        now: Optional[datetime] = None,
+        timestamp: Optional[str] = None
+    ):
         """
         Start multispectral camera measurement
 
         Args:
             measurement_id: ID of the measurement
             date_time: Timestamp for the measurement
+            folder_id: Drive folder of the measurement, if already resolved by the caller
+            now: Timestamp for the file records, shared by every component of a measurement
+            timestamp: File name timestamp, if already formatted by the caller
 
         Returns:
             Status of the measurement
         """
         try:
-            # Create multispectral camera service
-            ms_camera = AravisCameraService(camera_id="00:11:1c:f9:50:a4")
-            if not ms_camera.connect():
-                logger.error("Failed to connect to multispectral camera")
-                return {"status": "error", "message": "Failed to connect to multispectral camera"}
-
-            # Capture image as blob
-            timestamp = date_time.strftime("%Y%m%d%H%M%S")
+            timestamp = timestamp or _file_timestamp(date_time)
             ms_filename = f"Multispectral_{timestamp}.png"
             format = "PNG"
 
-            # Get image as blob
-            image_blob = ms_camera.get_image_blob(format=format)
-            if not image_blob:
+            # The camera is released when the block exits; it isn't needed for the upload
+            async with _camera_session("00:11:1c:f9:50:a4") as ms_camera:
+                # Camera warm-up and Drive folder resolution touch disjoint resources,
+                # so run them side by side
+                connected, (folder_id, error) = await asyncio.gather(
+                    asyncio.to_thread(ms_camera.connect),
+                    self._resolve_measurement_folder(measurement_id, folder_id)
+                )
+                if not connected:
+                    logger.error("Failed to connect to multispectral camera")
+                    return {"status": "error", "message": "Failed to connect to multispectral camera"}
+                if error:
+                    return error
+
+                # Get image as an in-memory stream
+                image_stream = await ms_camera.get_image_stream_async(
+                    format=format, compress_level=CAPTURE_PNG_COMPRESS_LEVEL
+                )
+
+            if image_stream is None:
                 logger.error("Failed to capture image from multispectral camera")
-                ms_camera.disconnect()
                 return {"status": "error", "message": "Failed to capture image from multispectral camera"}
 
             # Upload to Google Drive
-            drive_service = GoogleDriveService()
-            if not drive_service.authenticate():
-                logger.error("Failed to authenticate with Google Drive")
-                ms_camera.disconnect()
-                return {"status": "error", "message": "Failed to authenticate with Google Drive"}
-
-            folder_path = f"/measurements/{measurement_id}"
-            folder_id = drive_service.create_folder_path(folder_path)
-            if not folder_id:
-                logger.error(f"Failed to create folder for measurement {measurement_id}")
-                ms_camera.disconnect()
-                return {"status": "error", "message": "Failed to create folder in Google Drive"}
-
-            file_id = drive_service.upload_file_to_path(
-                file_content=io.BytesIO(image_blob),
+            drive_service = GoogleDriveService.get_instance()
+            file_id = await drive_service.upload_file_async(
+                file_content=image_stream,
                 file_name=ms_filename,
-                folder_path=folder_path,
+                parent_id=folder_id,
                 mime_type=f"image/{format.lower()}",
                 is_path=False
             )
 
             if not file_id:
                 logger.error("Failed to upload multispectral image to Google Drive")
-                ms_camera.disconnect()
                 return {"status": "error", "message": "Failed to upload image to Google Drive"}
 
             # Save file reference to the database with timestamps
-            now = datetime.utcnow()
+            now = now or datetime.now(timezone.utc)
             file = MeasurementFileOrm(
                 name=ms_filename,
                 google_drive_file_id=file_id,
@@ -243,14 +316,21 @@ class MeasurementService:
             )
             await self.file_repo.save(file)
 
-            ms_camera.disconnect()
             return {"status": "success", "message": f"Multispectral measurement {measurement_id} completed successfully", "file_id": file_id}
 
         except Exception as e:
             logger.error(f"Error during multispectral measurement: {e}")
             return {"status": "error", "message": f"Error during multispectral measurement: {str(e)}"}
 
-    async def capture_acoustic_data(self, measurement_id: int, number_of_sensors: int, length_of_ae: float):
+    async def capture_acoustic_data(
+        self,
+        measurement_id: int,
+        number_of_sensors: int,
+        length_of_ae: float,
+        folder_id: Optional[str] = None,
+        now: Optional[datetime] = None,
+        timestamp: Optional[str] = None
+    ):
         """
         Capture acoustic emission data
 
@@ -258,6 +338,9 @@ class MeasurementService:
             measurement_id: ID of the measurement
             number_of_sensors: Number of acoustic sensors to use
             length_of_ae: Duration of acoustic capture in seconds
+            folder_id: Drive folder of the measurement, if already resolved by the caller
+            now: Timestamp for the file names and records, shared by every component of a measurement
+            timestamp: File name timestamp, if already formatted by the caller
 
         Returns:
             Status of the acoustic capture
@@ -266,62 +349,61 @@ class MeasurementService:
             # This would interface with your acoustic emission system
             # For now, we'll use a mock file as placeholder
 
-            timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
-            drive_service = GoogleDriveService()
-
-            if not drive_service.authenticate():
-                logger.error("Failed to authenticate with Google Drive")
-                return {"status": "error", "message": "Failed to authenticate with Google Drive"}
-
-            folder_path = f"/measurements/{measurement_id}"
-            folder_id = drive_service.create_folder_path(folder_path)
-
-            if not folder_id:
-                logger.error(f"Failed to create folder for measurement {measurement_id}")
-                return {"status": "error", "message": "Failed to create folder in Google Drive"}
+            now = now or datetime.now(timezone.utc)
+            timestamp = timestamp or _file_timestamp(now)
+            drive_service = GoogleDriveService.get_instance()
+            if folder_id is None:
+                folder_id, error = await self._resolve_measurement_folder(measurement_id)
+                if error:
+                    return error
+
+            # Read mock file content (cached after the first measurement)
+            try:
+                ae_content = await asyncio.to_thread(_ae_mock_bytes)
+            except FileNotFoundError:
+                logger.error(f"Acoustic emission mock file not found: {AE_MOCK_FILE}")
+                return {"status": "error", "message": f"Mock data file not found: {AE_MOCK_FILE}"}
 
             file_ids = []
+            uploads = []
 
-            # For each sensor, upload a mock file
+            # For each sensor, prepare a mock file
             for sensor_id in range(1, number_of_sensors + 1):
                 ae_filename = f"AE_sensor{sensor_id}_{timestamp}.txt"
-                ae_mock_file = "ae/ae.mock.txt"
-
-                # Check if the mock file exists
-                if not os.path.exists(ae_mock_file):
-                    logger.error(f"Acoustic emission mock file not found: {ae_mock_file}")
-                    return {"status": "error", "message": f"Mock data file not found: {ae_mock_file}"}
-                
-                # Read mock file content
-                with open(ae_mock_file, 'rb') as f:
-                    ae_content = f.read()
-
-                # Upload to Google Drive
-                file_id = drive_service.upload_file_to_path(
-                    file_content=io.BytesIO(ae_content),
-                    file_name=ae_filename,
-                    folder_path=folder_path,
-                    mime_type="text/plain",
-                    is_path=False
-                )
-
+                uploads.append({
+                    "file_content": io.BytesIO(ae_content),
+                    "file_name": ae_filename,
+                    "mime_type": "text/plain",
+                })
+
+            # Upload every sensor's file to Google Drive concurrently
+            uploaded_ids = await drive_service.upload_files_to_path_async(uploads, parent_id=folder_id)
+
+            files = []
+            failed_sensor_id = None
+            for sensor_id, (upload, file_id) in enumerate(zip(uploads, uploaded_ids), start=1):
                 if not file_id:
                     logger.error(f"Failed to upload acoustic data for sensor {sensor_id} to Google Drive")
-                    return {"status": "error", "message": f"Failed to upload acoustic data for sensor {sensor_id}"}
+                    failed_sensor_id = failed_sensor_id or sensor_id
+                    continue
 
-                # Save file reference to the database with timestamps
-                now = datetime.utcnow()
-                file = MeasurementFileOrm(
-                    name=ae_filename,
+                # File reference for the database with timestamps
+                files.append(MeasurementFileOrm(
+                    name=upload["file_name"],
                     google_drive_file_id=file_id,
                     measurement_id=measurement_id,
                     created_at=now,
                     updated_at=now
-                )
-                await self.file_repo.save(file)
-
+                ))
                 file_ids.append(file_id)
 
+            # Record every file that did reach Drive, in one INSERT
+            if files:
+                await self.file_repo.save_many(files)
+
+            if failed_sensor_id is not None:
+                return {"status": "error", "message": f"Failed to upload acoustic data for sensor {failed_sensor_id}"}
+
             return {"status": "success", "message": f"Acoustic data captured for {number_of_sensors} sensors", "file_ids": file_ids}
 
         except Exception as e:
@@ -336,12 +418,23 @@ class MeasurementService:
             config: Measurement configuration
 
         Returns:
-            The created measurement info if successful, None otherwise
+            The created measurement info if successful, None otherwise (also when the
+            configuration enables no component)
         """
+        # Nothing to capture: don't leave an empty measurement row behind
+        capture_acoustic = config.number_of_sensors > 0 and config.length_of_ae > 0
+        if not (config.rgb_camera or config.multispectral_camera or capture_acoustic):
+            logger.warning("Measurement config has no enabled components, nothing to start")
+            return None
+
         try:
+            # One timestamp for the measurement and all of its file records and names
+            now = datetime.now(timezone.utc)
+            timestamp = _file_timestamp(now)
+
             # Create a new measurement record
             measurement = MeasurementInfoOrm(
-                date_time=datetime.utcnow(),
+                date_time=now,
                 rgb_camera=config.rgb_camera,
                 multispectral_camera=config.multispectral_camera,
                 number_of_sensors=config.number_of_sensors,
@@ -352,42 +445,57 @@ class MeasurementService:
             # Save the measurement
             measurement = await self.measurement_repo.save_new_measurement(measurement)
 
-            # Process each component based on configuration
-            results = []
+            # Resolve the measurement's Drive folder once for all components; if this
+            # fails, each component retries it and reports the error itself
+            folder_id, _ = await self._resolve_measurement_folder(measurement.id)
+
+            # Process each component based on configuration; they are independent,
+            # so their capture and upload run concurrently
+            components = []
 
             # RGB camera
             if config.rgb_camera:
-                rgb_result = await self.start_rgb_measurement(
+                components.append(self.start_rgb_measurement(
                     measurement_id=measurement.id,
                     date_time=measurement.date_time,
-                    duration=int(config.length_of_ae)
-                )
-                results.append(rgb_result)
+                    duration=int(config.length_of_ae),
+                    folder_id=folder_id,
+                    now=now,
+                    timestamp=timestamp
+                ))
 
             # Multispectral camera
             if config.multispectral_camera:
-                ms_result = await self.start_multispectral_measurement(
+                components.append(self.start_multispectral_measurement(
                     measurement_id=measurement.id,
-                    date_time=measurement.date_time
-                )
-                results.append(ms_result)
+                    date_time=measurement.date_time,
+                    folder_id=folder_id,
+                    now=now,
+                    timestamp=timestamp
+                ))
 
             # Acoustic data
-            if config.number_of_sensors > 0 and config.length_of_ae > 0:
-                ae_result = await self.capture_acoustic_data(
+            if capture_acoustic:
+                components.append(self.capture_acoustic_data(
                     measurement_id=measurement.id,
                     number_of_sensors=config.number_of_sensors,
-                    length_of_ae=config.length_of_ae
-                )
-                results.append(ae_result)
+                    length_of_ae=config.length_of_ae,
+                    folder_id=folder_id,
+                    now=now,
+                    timestamp=timestamp
+                ))
+
+            results = await asyncio.gather(*components, return_exceptions=True)
 
             # Check if any component failed
             for result in results:
-                if result.get("status") == "error":
+                if isinstance(result, BaseException):
+                    logger.error(f"Measurement component failed: {result}")
+                elif result.get("status") == "error":
                     logger.error(f"Measurement component failed: {result.get('message')}")
-                    # We still return the measurement since some components might have succeeded
+                # We still return the measurement since some components might have succeeded
 
-            return MeasurementInfoSchema.from_orm(measurement)
+            return measurement
 
         except Exception as e:
             logger.error(f"Error starting measurement by config: {e}")
@@ -1,7 +1,9 @@
 import os
 import io
+import asyncio
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import List, Tuple, Optional
 
 from app.models.measurement import MeasurementInfoOrm, MeasurementInfoSchema, MeasurementConfigSchema
@@ -10,10 +12,21 @@ from app.models.pageable import PageRequestSchema
 from app.repository.measurement_repository import MeasurementRepository
 from app.repository.measurement_file_repository import MeasurementFileRepository
 from app.services.google_drive_service import GoogleDriveService
+from app.services.measurement_service import _file_timestamp
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _read_test_asset(path: str) -> bytes:
+    """
+    Read a test asset once per process; the files don't change while the app runs.
+    Call it through asyncio.to_thread so the first, uncached read stays off the event loop.
+    """
+    with open(path, 'rb') as f:
+        return f.read()
+
+
 class MeasurementServiceTest:
     """
     Test version of the measurement service that doesn't use real cameras.
@@ -36,63 +49,59 @@ class MeasurementServiceTest:
         """
         return await self.measurement_repo.save_new_measurement(measurement)
 
-    async def get_measurement(self, measurement_id: int) -> Optional[MeasurementInfoOrm]:
+    async def get_measurement(self, measurement_id: int, with_files: bool = True) -> Optional[MeasurementInfoOrm]:
         """
-        Get a measurement by ID
+        Get a measurement by ID, with its files eager loaded if with_files is set
         """
-        return await self.measurement_repo.get_measurement_by_id(measurement_id)
-        
+        return await self.measurement_repo.get_measurement_by_id(measurement_id, with_files=with_files)
+
     async def get_measurement_with_files(self, measurement_id: int) -> Optional[MeasurementInfoOrm]:
         """
         Get a measurement by ID with files eager loaded
-        
+
         Args:
             measurement_id: ID of the measurement
-            
+
         Returns:
             MeasurementInfoOrm with files loaded or None if not found
         """
-        measurement = await self.measurement_repo.get_measurement_by_id(measurement_id)
-        # The relationship is configured with lazy="selectin", so files should be loaded
-        return measurement
+        return await self.get_measurement(measurement_id, with_files=True)
 
-    async def get_latest_measurement_info(self) -> List[MeasurementInfoOrm]:
+    async def get_latest_measurement_info(self, with_files: bool = True) -> List[MeasurementInfoOrm]:
         """
-        Get the latest measurements
+        Get the latest measurements, with their files eager loaded if with_files is set
         """
-        return await self.measurement_repo.get_latest_measurement_info()
-        
+        return await self.measurement_repo.get_latest_measurement_info(with_files=with_files)
+
     async def get_latest_measurements_with_files(self) -> List[MeasurementInfoOrm]:
         """
         Get the latest measurements with files eager loaded
-        
+
         Returns:
             List of MeasurementInfoOrm with files loaded
         """
-        measurements = await self.measurement_repo.get_latest_measurement_info()
-        # The relationship is configured with lazy="selectin", so files should be loaded
-        return measurements
+        return await self.get_latest_measurement_info(with_files=True)
 
-    async def get_measurement_history(self, start_date: datetime, end_date: datetime) -> List[MeasurementInfoOrm]:
+    async def get_measurement_history(
+        self, start_date: datetime, end_date: datetime, with_files: bool = True
+    ) -> List[MeasurementInfoOrm]:
         """
-        Get measurement history within a date range
+        Get measurement history within a date range, with files eager loaded if with_files is set
         """
-        return await self.measurement_repo.get_measurement_history(start_date, end_date)
-        
+        return await self.measurement_repo.get_measurement_history(start_date, end_date, with_files=with_files)
+
     async def get_measurement_history_with_files(self, start_date: datetime, end_date: datetime) -> List[MeasurementInfoOrm]:
         """
         Get measurement history within a date range with files eager loaded
-        
+
         Args:
             start_date: Beginning of the date range
             end_date: End of the date range
-            
+
         Returns:
             List of MeasurementInfoOrm with files loaded
         """
-        measurements = await self.measurement_repo.get_measurement_history(start_date, end_date)
-        # The relationship is configured with lazy="selectin", so files should be loaded
-        return measurements
+        return await self.get_measurement_history(start_date, end_date, with_files=True)
 
     async def delete_measurement(self, measurement: MeasurementInfoOrm) -> None:
         """
@@ -106,7 +115,42 @@ class MeasurementServiceTest:
         """
         return await self.measurement_repo.get_paged_measurements(pageable)
 
-    async def start_rgb_measurement(self, measurement_id: int, date_time: datetime, duration: int):
+    async def _resolve_measurement_folder(
+        self, measurement_id: int, folder_id: Optional[str] = None
+    ) -> Tuple[Optional[str], Optional[dict]]:
+        """
+        Find or create the Google Drive folder of a measurement
+
+        Args:
+            measurement_id: ID of the measurement
+            folder_id: Folder already resolved by the caller; returned as is
+
+        Returns:
+            (folder ID, None) on success, or (None, error status) on failure
+        """
+        if folder_id is not None:
+            return folder_id, None
+
+        drive_service = GoogleDriveService.get_instance()
+        if not await drive_service.ensure_authenticated_async():
+            logger.error("Failed to authenticate with Google Drive")
+            return None, {"status": "error", "message": "Failed to authenticate with Google Drive"}
+
+        folder_id = await drive_service.create_folder_path_async(f"/measurements/{measurement_id}")
+        if not folder_id:
+            logger.error(f"Failed to create folder for measurement {measurement_id}")
+            return None, {"status": "error", "message": "Failed to create folder in Google Drive"}
+        return folder_id, None
+
+    async def start_rgb_measurement(
+        self,
+        measurement_id: int,
+        date_time: datetime,
+        duration: int,
+        folder_id: Optional[str] = None,
+        now: Optional[datetime] = None,
+        timestamp: Optional[str] = None
+    ):
         """
         Start RGB camera measurement using test image instead of real camera
 
@@ -114,6 +158,9 @@ class MeasurementServiceTest:
             measurement_id: ID of the measurement
             date_time: Timestamp for the measurement
             duration: Duration of the measurement in seconds
+            folder_id: Drive folder of the measurement, if already resolved by the caller
+            now: Timestamp for the file records, shared by every component of a measurement
+            timestamp: File name timestamp, if already formatted by the caller
 
         Returns:
             Status of the measurement
@@ -122,36 +169,28 @@ class MeasurementServiceTest:
             # Use test image instead of connecting to camera
             logger.info(f"Using test image {self.test_image_path} instead of RGB camera capture")
             
-            # Check if the test image exists
-            if not os.path.exists(self.test_image_path):
+            # Read test image content
+            try:
+                image_blob = await asyncio.to_thread(_read_test_asset, self.test_image_path)
+            except FileNotFoundError:
                 logger.error(f"Test image not found: {self.test_image_path}")
                 return {"status": "error", "message": f"Test image not found: {self.test_image_path}"}
             
-            # Read test image content
-            with open(self.test_image_path, 'rb') as f:
-                image_blob = f.read()
-            
             # Capture image as blob
-            timestamp = date_time.strftime("%Y%m%d%H%M%S")
+            timestamp = timestamp or _file_timestamp(date_time)
             rgb_filename = f"RGB_{timestamp}.png"
             format = "PNG"
 
             # Upload to Google Drive
-            drive_service = GoogleDriveService()
-            if not drive_service.authenticate():
-                logger.error("Failed to authenticate with Google Drive")
-                return {"status": "error", "message": "Failed to authenticate with Google Drive"}
-
-            folder_path = f"/measurements/{measurement_id}"
-            folder_id = drive_service.create_folder_path(folder_path)
-            if not folder_id:
-                logger.error(f"Failed to create folder for measurement {measurement_id}")
-                return {"status": "error", "message": "Failed to create folder in Google Drive"}
-
-            file_id = drive_service.upload_file_to_path(
+            folder_id, error = await self._resolve_measurement_folder(measurement_id, folder_id)
+            if error:
+                return error
+
+            drive_service = GoogleDriveService.get_instance()
+            file_id = await drive_service.upload_file_async(
                 file_content=io.BytesIO(image_blob),
                 file_name=rgb_filename,
-                folder_path=folder_path,
+                parent_id=folder_id,
                 mime_type=f"image/{format.lower()}",
                 is_path=False
             )
@@ -161,7 +200,7 @@ class MeasurementServiceTest:
                 return {"status": "error", "message": "Failed to upload image to Google Drive"}
 
             # Save file reference to the database with timestamps
-            now = datetime.now()
+            now = now or datetime.now(timezone.utc)
             file = MeasurementFileOrm(
                 name=rgb_filename,
                 google_drive_file_id=file_id,
@@ -177,13 +216,23 @@ class MeasurementServiceTest:
             logger.error(f"Error during RGB measurement: {e}")
             return {"status": "error", "message": f"Error during RGB measurement: {str(e)}"}
 
-    async def start_multispectral_measurement(self, measurement_id: int, date_time: datetime):
+    async def start_multispectral_measurement(
+        self,
+        measurement_id: int,
+        date_time: datetime,
+        folder_id: Optional[str] = None,
+        now: Optional[datetime] = None,
+        timestamp: Optional[str] = None
+    ):
         """
         Start multispectral camera measurement using test image instead of real camera
 
         Args:
             measurement_id: ID of the measurement
             date_time: Timestamp for the measurement
+            folder_id: Drive folder of the measurement, if already resolved by the caller
+            now: Timestamp for the file records, shared by every component of a measurement
+            timestamp: File name timestamp, if already formatted by the caller
 
         Returns:
             Status of the measurement
@@ -192,36 +241,28 @@ class MeasurementServiceTest:
             # Use test image instead of connecting to camera
             logger.info(f"Using test image {self.test_image_path} instead of multispectral camera capture")
             
-            # Check if the test image exists
-            if not os.path.exists(self.test_image_path):
+            # Read test image content
+            try:
+                image_blob = await asyncio.to_thread(_read_test_asset, self.test_image_path)
+            except FileNotFoundError:
                 logger.error(f"Test image not found: {self.test_image_path}")
                 return {"status": "error", "message": f"Test image not found: {self.test_image_path}"}
             
-            # Read test image content
-            with open(self.test_image_path, 'rb') as f:
-                image_blob = f.read()
-            
             # Capture image as blob
-            timestamp = date_time.strftime("%Y%m%d%H%M%S")
+            timestamp = timestamp or _file_timestamp(date_time)
             ms_filename = f"Multispectral_{timestamp}.png"
             format = "PNG"
 
             # Upload to Google Drive
-            drive_service = GoogleDriveService()
-            if not drive_service.authenticate():
-                logger.error("Failed to authenticate with Google Drive")
-                return {"status": "error", "message": "Failed to authenticate with Google Drive"}
-
-            folder_path = f"/measurements/{measurement_id}"
-            folder_id = drive_service.create_folder_path(folder_path)
-            if not folder_id:
-                logger.error(f"Failed to create folder for measurement {measurement_id}")
-                return {"status": "error", "message": "Failed to create folder in Google Drive"}
-
-            file_id = drive_service.upload_file_to_path(
+            folder_id, error = await self._resolve_measurement_folder(measurement_id, folder_id)
+            if error:
+                return error
+
+            drive_service = GoogleDriveService.get_instance()
+            file_id = await drive_service.upload_file_async(
                 file_content=io.BytesIO(image_blob),
                 file_name=ms_filename,
-                folder_path=folder_path,
+                parent_id=folder_id,
                 mime_type=f"image/{format.lower()}",
                 is_path=False
             )
@@ -231,7 +272,7 @@ class MeasurementServiceTest:
                 return {"status": "error", "message": "Failed to upload image to Google Drive"}
 
             # Save file reference to the database with timestamps
-            now = datetime.now()
+            now = now or datetime.now(timezone.utc)
             file = MeasurementFileOrm(
                 name=ms_filename,
                 google_drive_file_id=file_id,
@@ -247,7 +288,15 @@ class MeasurementServiceTest:
             logger.error(f"Error during multispectral measurement: {e}")
             return {"status": "error", "message": f"Error during multispectral measurement: {str(e)}"}
 
-    async def capture_acoustic_data(self, measurement_id: int, number_of_sensors: int, length_of_ae: float):
+    async def capture_acoustic_data(
+        self,
+        measurement_id: int,
+        number_of_sensors: int,
+        length_of_ae: float,
+        folder_id: Optional[str] = None,
+        now: Optional[datetime] = None,
+        timestamp: Optional[str] = None
+    ):
         """
         Capture acoustic emission data using test file
 
@@ -255,66 +304,68 @@ class MeasurementServiceTest:
             measurement_id: ID of the measurement
             number_of_sensors: Number of acoustic sensors to use
             length_of_ae: Duration of acoustic capture in seconds
+            folder_id: Drive folder of the measurement, if already resolved by the caller
+            now: Timestamp for the file names and records, shared by every component of a measurement
+            timestamp: File name timestamp, if already formatted by the caller
 
         Returns:
             Status of the acoustic capture
         """
         try:
-            timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
-            drive_service = GoogleDriveService()
-
-            if not drive_service.authenticate():
-                logger.error("Failed to authenticate with Google Drive")
-                return {"status": "error", "message": "Failed to authenticate with Google Drive"}
-
-            folder_path = f"/measurements/{measurement_id}"
-            folder_id = drive_service.create_folder_path(folder_path)
-
-            if not folder_id:
-                logger.error(f"Failed to create folder for measurement {measurement_id}")
-                return {"status": "error", "message": "Failed to create folder in Google Drive"}
+            now = now or datetime.now(timezone.utc)
+            timestamp = timestamp or _file_timestamp(now)
+            drive_service = GoogleDriveService.get_instance()
+            folder_id, error = await self._resolve_measurement_folder(measurement_id, folder_id)
+            if error:
+                return error
+
+            # Read mock file content; every sensor uploads the same data
+            try:
+                ae_content = await asyncio.to_thread(_read_test_asset, self.ae_mock_file)
+            except FileNotFoundError:
+                logger.error(f"Acoustic emission mock file not found: {self.ae_mock_file}")
+                return {"status": "error", "message": f"Mock data file not found: {self.ae_mock_file}"}
 
             file_ids = []
+            uploads = []
 
-            # For each sensor, upload a mock file
+            # For each sensor, prepare a mock file
             for sensor_id in range(1, number_of_sensors + 1):
                 ae_filename = f"AE_sensor{sensor_id}_{timestamp}.txt"
-
-                # Check if the mock file exists
-                if not os.path.exists(self.ae_mock_file):
-                    logger.error(f"Acoustic emission mock file not found: {self.ae_mock_file}")
-                    return {"status": "error", "message": f"Mock data file not found: {self.ae_mock_file}"}
-                
-                # Read mock file content
-                with open(self.ae_mock_file, 'rb') as f:
-                    ae_content = f.read()
-
-                # Upload to Google Drive
-                file_id = drive_service.upload_file_to_path(
-                    file_content=io.BytesIO(ae_content),
-                    file_name=ae_filename,
-                    folder_path=folder_path,
-                    mime_type="text/plain",
-                    is_path=False
-                )
-
+                uploads.append({
+                    "file_content": io.BytesIO(ae_content),
+                    "file_name": ae_filename,
+                    "mime_type": "text/plain",
+                })
+
+            # Upload every sensor's file to Google Drive concurrently
+            uploaded_ids = await drive_service.upload_files_to_path_async(uploads, parent_id=folder_id)
+
+            files = []
+            failed_sensor_id = None
+            for sensor_id, (upload, file_id) in enumerate(zip(uploads, uploaded_ids), start=1):
                 if not file_id:
                     logger.error(f"Failed to upload acoustic data for sensor {sensor_id} to Google Drive")
-                    return {"status": "error", "message": f"Failed to upload acoustic data for sensor {sensor_id}"}
+                    failed_sensor_id = failed_sensor_id or sensor_id
+                    continue
 
-                # Save file reference to the database with timestamps
-                now = datetime.now()
-                file = MeasurementFileOrm(
-                    name=ae_filename,
+                # File reference for the database with timestamps
+                files.append(MeasurementFileOrm(
+                    name=upload["file_name"],
                     google_drive_file_id=file_id,
                     measurement_id=measurement_id,
                     created_at=now,
                     updated_at=now
-                )
-                await self.file_repo.save(file)
-
+                ))
                 file_ids.append(file_id)
 
+            # Record every file that did reach Drive, in one INSERT
+            if files:
+                await self.file_repo.save_many(files)
+
+            if failed_sensor_id is not None:
+                return {"status": "error", "message": f"Failed to upload acoustic data for sensor {failed_sensor_id}"}
+
             return {"status": "success", "message": f"Acoustic data captured for {number_of_sensors} sensors", "file_ids": file_ids}
 
         except Exception as e:
@@ -329,12 +380,23 @@ class MeasurementServiceTest:
             config: Measurement configuration
 
         Returns:
-            The created measurement info if successful, None otherwise
+            The created measurement info if successful, None otherwise (also when the
+            configuration enables no component)
         """
+        # Nothing to capture: don't leave an empty measurement row behind
+        capture_acoustic = config.number_of_sensors > 0 and config.length_of_ae > 0
+        if not (config.rgb_camera or config.multispectral_camera or capture_acoustic):
+            logger.warning("Measurement config has no enabled components, nothing to start")
+            return None
+
         try:
+            # One timestamp for the measurement and all of its file records and names
+            now = datetime.now(timezone.utc)
+            timestamp = _file_timestamp(now)
+
             # Create a new measurement record
             measurement = MeasurementInfoOrm(
-                date_time=datetime.utcnow(),
+                date_time=now,
                 rgb_camera=config.rgb_camera,
                 multispectral_camera=config.multispectral_camera,
                 number_of_sensors=config.number_of_sensors,
@@ -345,44 +407,59 @@ class MeasurementServiceTest:
             # Save the measurement
             measurement = await self.measurement_repo.save_new_measurement(measurement)
 
-            # Process each component based on configuration
-            results = []
-            
+            # Resolve the measurement's Drive folder once for all components; if this
+            # fails, each component retries it and reports the error itself
+            folder_id, _ = await self._resolve_measurement_folder(measurement.id)
+
+            # Process each component based on configuration; they are independent,
+            # so they run concurrently
+            components = []
+
             logger.info(f"Starting test measurement with config: RGB={config.rgb_camera}, MS={config.multispectral_camera}, Sensors={config.number_of_sensors}")
 
             # RGB camera
             if config.rgb_camera:
-                rgb_result = await self.start_rgb_measurement(
+                components.append(self.start_rgb_measurement(
                     measurement_id=measurement.id,
                     date_time=measurement.date_time,
-                    duration=int(config.length_of_ae)
-                )
-                results.append(rgb_result)
+                    duration=int(config.length_of_ae),
+                    folder_id=folder_id,
+                    now=now,
+                    timestamp=timestamp
+                ))
 
             # Multispectral camera
             if config.multispectral_camera:
-                ms_result = await self.start_multispectral_measurement(
+                components.append(self.start_multispectral_measurement(
                     measurement_id=measurement.id,
-                    date_time=measurement.date_time
-                )
-                results.append(ms_result)
+                    date_time=measurement.date_time,
+                    folder_id=folder_id,
+                    now=now,
+                    timestamp=timestamp
+                ))
 
             # Acoustic data
-            if config.number_of_sensors > 0 and config.length_of_ae > 0:
-                ae_result = await self.capture_acoustic_data(
+            if capture_acoustic:
+                components.append(self.capture_acoustic_data(
                     measurement_id=measurement.id,
                     number_of_sensors=config.number_of_sensors,
-                    length_of_ae=config.length_of_ae
-                )
-                results.append(ae_result)
+                    length_of_ae=config.length_of_ae,
+                    folder_id=folder_id,
+                    now=now,
+                    timestamp=timestamp
+                ))
+
+            results = await asyncio.gather(*components, return_exceptions=True)
 
             # Check if any component failed
             for result in results:
-                if result.get("status") == "error":
+                if isinstance(result, BaseException):
+                    logger.error(f"Measurement component failed: {result}")
+                elif result.get("status") == "error":
                     logger.error(f"Measurement component failed: {result.get('message')}")
-                    # We still return the measurement since some components might have succeeded
+                # We still return the measurement since some components might have succeeded
 
-            return MeasurementInfoSchema.from_orm(measurement)
+            return measurement
 
         except Exception as e:
             logger.error(f"Error starting measurement by config: {e}")
@@ -1,9 +1,20 @@
 from datetime import datetime, timezone
+from typing import Any, Dict
 
 from app.models.measurement import MeasurementConfigSchema
 from app.repository.settings_repository import SettingsRepository
 from app.services.cron_scheduler import CronScheduler
 
+# Fields a client can change; id and timestamps don't make a config different
+CONFIG_FIELDS = (
+    "measurement_frequency",
+    "first_measurement",
+    "rgb_camera",
+    "multispectral_camera",
+    "number_of_sensors",
+    "length_of_ae",
+)
+
 
 class SettingsService:
     """
@@ -18,12 +29,19 @@ class SettingsService:
         """
         return await self.settings_repo.get_measurement_config()
 
+    async def get_measurement_config_dict(self) -> Dict[str, Any]:
+        """
+        Get the current measurement configuration as a plain dict for serialization
+        """
+        return await self.settings_repo.get_measurement_config_dict()
+
     async def update_measurement_config(self, config: MeasurementConfigSchema) -> MeasurementConfigSchema:
         """
         Update the measurement configuration
         
         This method updates the existing configuration record rather than creating a new one.
         It also updates the measurement scheduler if frequency or first measurement time changes.
+        A config equal to the stored one is returned as-is, without a write.
         """
         old_config = await self.settings_repo.get_measurement_config()
 
@@ -34,15 +52,22 @@ class SettingsService:
         if old_config.first_measurement.tzinfo is None:
             old_config.first_measurement = old_config.first_measurement.replace(tzinfo=timezone.utc)
 
+        # Nothing changed: skip the write and leave the scheduler alone
+        if all(getattr(config, field) == getattr(old_config, field) for field in CONFIG_FIELDS):
+            return old_config
+
         # Update the existing configuration in the repository
         updated_config = await self.settings_repo.update_measurement_config(config)
 
+        # Drop the scheduler's cached copy so the next run picks up the new config
+        scheduler = CronScheduler.get_instance()
+        scheduler.bump_version()
+
         # Update scheduler if frequency or first measurement changed
         if (
                 config.measurement_frequency != old_config.measurement_frequency or
                 config.first_measurement != old_config.first_measurement
         ):
-            scheduler = CronScheduler.get_instance()
             scheduler.set_new_schedule(
                 config.measurement_frequency,
                 config.first_measurement,
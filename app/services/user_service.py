@@ -1,7 +1,11 @@
+import asyncio
 from typing import Optional, List
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.models.user import UserOrm, UserCreateSchema
 from app.repository.user_repository import UserRepository
+from app.utils.db_session import get_db_session
 
 
 class UserService:
@@ -12,23 +16,27 @@ class UserService:
     def __init__(self):
         self.user_repo: UserRepository = UserRepository()
 
-    async def get_all_users(self) -> List[UserOrm]:
+    async def get_all_users(self, *, session: Optional[AsyncSession] = None) -> List[UserOrm]:
         """
         Get all users
         """
-        return await self.user_repo.get_all_users()
+        return await self.user_repo.get_all_users(session=session)
 
-    async def get_user_by_id(self, user_id: int) -> Optional[UserOrm]:
+    async def get_user_by_id(
+        self, user_id: int, *, session: Optional[AsyncSession] = None
+    ) -> Optional[UserOrm]:
         """
         Get a user by ID
         """
-        return await self.user_repo.get_user_by_id(user_id)
+        return await self.user_repo.get_user_by_id(user_id, session=session)
 
-    async def get_user_by_username(self, username: str) -> Optional[UserOrm]:
+    async def get_user_by_username(
+        self, username: str, *, session: Optional[AsyncSession] = None
+    ) -> Optional[UserOrm]:
         """
         Get a user by username
         """
-        return await self.user_repo.get_user_by_username(username)
+        return await self.user_repo.get_user_by_username(username, session=session)
 
     async def create_user(self, user_data: UserCreateSchema) -> UserOrm:
         """
@@ -42,21 +50,25 @@ class UserService:
         Validate user credentials
         """
         user = await self.user_repo.get_user_by_username(username)
-        if user and user.validate_password(password):
+        if user and await asyncio.to_thread(user.validate_password, password):
             return user
         return None
 
-    async def update_refresh_token(self, user_id: int, refresh_token: str) -> None:
+    async def update_refresh_token(
+        self, user_id: int, refresh_token: str, *, session: Optional[AsyncSession] = None
+    ) -> None:
         """
         Update refresh token for a user
         """
-        await self.user_repo.update_user_refresh_token(user_id, refresh_token)
+        await self.user_repo.update_user_refresh_token(user_id, refresh_token, session=session)
 
-    async def delete_refresh_token(self, user_id: int) -> None:
+    async def delete_refresh_token(
+        self, user_id: int, *, session: Optional[AsyncSession] = None
+    ) -> None:
         """
         Delete refresh token for a user
         """
-        await self.user_repo.delete_user_refresh_token(user_id)
+        await self.user_repo.delete_user_refresh_token(user_id, session=session)
 
     async def delete_user(self, user_id: int) -> bool:
         """
@@ -68,11 +80,13 @@ class UserService:
         Returns:
             bool: True if the user was successfully deleted, False if user not found
         """
-        # Check if user exists
-        user = await self.get_user_by_id(user_id)
-        if not user:
-            return False
+        # Lookup and delete share one connection and transaction
+        async with get_db_session() as session:
+            # Check if user exists
+            user = await self.user_repo.get_user_by_id(user_id, session=session)
+            if not user:
+                return False
 
-        # Delete the user
-        await self.user_repo.delete_by_id(user_id)
-        return True
+            # Delete the user
+            await self.user_repo.delete_by_id(user_id, session=session)
+            return True
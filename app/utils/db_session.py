@@ -1,27 +1,59 @@
+import asyncio
 from contextlib import asynccontextmanager
+from typing import Optional
 from typing_extensions import AsyncGenerator
 
-from sqlalchemy import AsyncAdaptedQueuePool
+import orjson
+from sqlalchemy import AsyncAdaptedQueuePool, text
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine, AsyncSession
 
 from app.config.settings import get_database_settings
 
-async_url = get_database_settings().async_url
-engine = create_async_engine(async_url,
-                             pool_pre_ping=True,
+db_settings = get_database_settings()
+# asyncpg keeps prepared statements per connection and SQLAlchemy caches the
+# compiled SQL, so repeated lookups skip both the compile and the server parse
+engine = create_async_engine(db_settings.async_url,
+                             pool_pre_ping=db_settings.pool_pre_ping,
                              poolclass=AsyncAdaptedQueuePool,
-                             pool_size=1,
-                             max_overflow=1)
+                             pool_size=db_settings.pool_size,
+                             max_overflow=db_settings.max_overflow,
+                             pool_recycle=db_settings.pool_recycle,
+                             query_cache_size=db_settings.query_cache_size,
+                             json_serializer=lambda value: orjson.dumps(value).decode(),
+                             json_deserializer=orjson.loads,
+                             connect_args={
+                                 "prepared_statement_cache_size": db_settings.prepared_statement_cache_size,
+                             })
 sessionmaker = async_sessionmaker(bind=engine, expire_on_commit=False)
 
 
 @asynccontextmanager
-async def get_db_session() -> AsyncGenerator:
+async def get_db_session(session: Optional[AsyncSession] = None) -> AsyncGenerator:
+    """
+    Open a session in its own transaction, or reuse the caller's session as-is
+
+    Args:
+        session: Session already owned by the caller (e.g. to run several repository calls in one transaction)
+    """
+    if session is not None:
+        yield session
+        return
     session = sessionmaker()
     async with session.begin():
         yield session
 
 
+async def warm_connection_pool() -> None:
+    """
+    Open every pooled connection up front so the first requests don't pay for the connect
+    """
+    async def _warm_one() -> None:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    await asyncio.gather(*[_warm_one() for _ in range(db_settings.pool_size)])
+
+
 async def shutdown() -> None:
     if engine is not None:
         await engine.dispose()
@@ -1,13 +1,8 @@
 import asyncio
 import os
-from sqlalchemy import select, func
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
-from app.models.user import UserOrm, pwd_context
-from app.config.settings import get_database_settings
-
-# Get database settings
-db_settings = get_database_settings()
+from sqlalchemy import select, exists
+from app.models.user import UserOrm, get_pwd_context
+from app.utils import db_session
 
 # Admin user credentials
 ADMIN_USERNAME = 'admin'
@@ -16,33 +11,36 @@ ADMIN_FIRST_NAME = 'System'
 ADMIN_LAST_NAME = 'Administrator'
 
 async def create_admin_user():
-    # Create async engine and session
-    engine = create_async_engine(db_settings.async_url)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    
-    # Create a new session
-    async with async_session() as session:
+    # Use the app's configured engine and release its connections when done
+    try:
+        await _create_admin_user()
+    finally:
+        await db_session.shutdown()
+
+
+async def _create_admin_user():
+    async with db_session.get_db_session() as session:
         # Check if admin already exists
-        query = select(func.count()).select_from(UserOrm).where(UserOrm.user_name == ADMIN_USERNAME)
+        query = select(exists().where(UserOrm.user_name == ADMIN_USERNAME))
         result = await session.execute(query)
-        count = result.scalar()
+        admin_exists = result.scalar()
         
-        if count > 0:
+        if admin_exists:
             print(f"Admin user '{ADMIN_USERNAME}' already exists.")
             return
         
         # Create new admin user
         admin_user = UserOrm(
             user_name=ADMIN_USERNAME,
-            password=pwd_context.hash(ADMIN_PASSWORD),
+            password=get_pwd_context().hash(ADMIN_PASSWORD),
             first_name=ADMIN_FIRST_NAME,
             last_name=ADMIN_LAST_NAME,
             is_admin=True
         )
         
-        # Add to session and commit
+        # Insert now so errors surface before the summary; committed when the block exits
         session.add(admin_user)
-        await session.commit()
+        await session.flush()
         
         print(f"Admin user created successfully:")
         print(f"Username: {ADMIN_USERNAME}")
@@ -11,9 +11,25 @@ import pytest
 import pytest_asyncio
 from fastapi import FastAPI
 from httpx import AsyncClient
+from sqlalchemy import text
 
-from app.main import create_application
-from app.utils import db_session
+# Must be set before the app reads its settings
+os.environ.setdefault("FAST_PASSWORD_HASHING", "true")
+
+from app.main import create_application  # noqa: E402
+from app.services.cron_scheduler import CronScheduler  # noqa: E402
+from app.utils import db_session  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
+    """
+    One loop for the whole run, so pooled connections (bound to the loop that opened
+    them) carry over from test to test instead of being disposed after each one
+    """
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
 
 
 @pytest.fixture(scope="session")
@@ -27,7 +43,7 @@ async def async_client(app: FastAPI) -> AsyncGenerator:
         yield client
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(scope="session", autouse=True)
 def run_migrations() -> Generator[None, None, None]:
     logging.getLogger('alembic').setLevel(logging.WARNING)
     project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -38,10 +54,50 @@ def run_migrations() -> Generator[None, None, None]:
     alembic.command.upgrade(cfg, "head")
     yield
     alembic.command.downgrade(cfg, "base")
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def db_engine(run_migrations: None) -> AsyncGenerator:
     """
-    shutdown is needed to avoid this issue:
-    got Future <Future pending cb=[Protocol._on_waiter_completed()]> attached to a different loop
+    Open a pooled connection once the schema is in place, so the first test doesn't pay
+    for the connect, and dispose of the engine at the end of the run
+    """
+    async with db_session.engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+    yield db_session.engine
+    await db_session.shutdown()
+
 
-    https://docs.sqlalchemy.org/en/20/orm/extensions/asyncio.html#using-multiple-asyncio-event-loops
+@pytest.fixture
+def scheduler() -> Generator[CronScheduler, None, None]:
+    """
+    The scheduler singleton, with any schedule a test starts cancelled and its state
+    restored afterwards
+    """
+    scheduler = CronScheduler.get_instance()
+    state = dict(scheduler.__dict__)
+    yield scheduler
+    if scheduler._pending is not None:
+        scheduler._pending.cancel()
+    if scheduler.task is not None and scheduler.task is not state["task"]:
+        scheduler.task.cancel()
+    scheduler.__dict__.clear()
+    scheduler.__dict__.update(state)
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def db_transaction() -> AsyncGenerator:
+    """
+    Run each test in a transaction that is rolled back afterwards. Sessions opened by the
+    app are bound to its connection and commit into savepoints, so nothing a test writes
+    outlives it and the schema only has to be migrated once per run.
     """
-    asyncio.run(db_session.shutdown())
+    connection = await db_session.engine.connect()
+    transaction = await connection.begin()
+    db_session.sessionmaker.configure(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield connection
+    finally:
+        db_session.sessionmaker.configure(bind=db_session.engine, join_transaction_mode="conservative_savepoint")
+        await transaction.rollback()
+        await connection.close()
@@ -0,0 +1,91 @@
+import time
+
+from httpx import AsyncClient
+from jose import jwt
+
+from app.middleware import auth
+from app.middleware.auth import generate_access_token
+from app.models.user import UserOrm
+
+PROTECTED_URL = "/api/settings/measurement-config"
+
+
+def _user() -> UserOrm:
+    return UserOrm(
+        id=1, user_name="admin", first_name="Test", last_name="User", is_admin=True
+    )
+
+
+class TestAuthMiddleware:
+    async def test_missing_token(self, async_client: AsyncClient) -> None:
+        response = await async_client.get(PROTECTED_URL)
+
+        assert response.status_code == 403
+
+    async def test_invalid_token(self, async_client: AsyncClient) -> None:
+        response = await async_client.get(
+            PROTECTED_URL, headers={"Authorization": "Bearer not-a-token"}
+        )
+
+        assert response.status_code == 401
+        assert response.headers["WWW-Authenticate"] == "Bearer"
+
+    async def test_wrong_scheme(self, async_client: AsyncClient) -> None:
+        token = generate_access_token(_user())
+        response = await async_client.get(
+            PROTECTED_URL, headers={"Authorization": f"Basic {token}"}
+        )
+
+        assert response.status_code == 403
+
+    async def test_expired_token(self, async_client: AsyncClient) -> None:
+        token = jwt.encode(
+            {"id": 1, "is_admin": True, "user_name": "admin", "exp": int(time.time()) - 1},
+            auth.ACCESS_TOKEN_SECRET,
+            algorithm=auth.JWT_ALGORITHM,
+        )
+        response = await async_client.get(
+            PROTECTED_URL, headers={"Authorization": f"Bearer {token}"}
+        )
+
+        assert response.status_code == 401
+        assert token not in auth._token_cache
+
+    async def test_valid_token_is_cached(self, async_client: AsyncClient) -> None:
+        token = generate_access_token(_user())
+        headers = {"Authorization": f"bearer {token}"}
+
+        response = await async_client.get(PROTECTED_URL, headers=headers)
+
+        assert response.status_code == 200
+        payload, valid_until = auth._token_cache[token]
+        assert payload.user_name == "admin"
+        assert valid_until <= time.time() + auth.TOKEN_CACHE_TTL
+
+        # The second request is served from the cache
+        response = await async_client.get(PROTECTED_URL, headers=headers)
+        assert response.status_code == 200
+
+    async def test_cached_token_expires(self, async_client: AsyncClient) -> None:
+        token = generate_access_token(_user())
+        payload = auth._authenticate(token)
+        auth._token_cache[token] = (payload, time.time() - 1)
+
+        # A stale entry is dropped and the token decoded again
+        assert auth._authenticate(token) == payload
+        assert auth._token_cache[token][1] > time.time()
+
+    async def test_token_cache_is_bounded(self, monkeypatch) -> None:
+        monkeypatch.setattr(auth, "TOKEN_CACHE_SIZE", 2)
+        monkeypatch.setattr(auth, "_token_cache", auth.OrderedDict())
+        tokens = [
+            generate_access_token(
+                UserOrm(id=i, user_name=f"user{i}", is_admin=False)
+            )
+            for i in range(1, 4)
+        ]
+
+        for token in tokens:
+            assert auth._authenticate(token) is not None
+
+        assert list(auth._token_cache) == tokens[1:]
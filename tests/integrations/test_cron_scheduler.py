@@ -0,0 +1,104 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from app.models.measurement import MeasurementConfigSchema
+from app.services.cron_scheduler import RESCHEDULE_DEBOUNCE, CronScheduler
+
+
+def _record_applies(scheduler: CronScheduler) -> list:
+    """
+    Replace _apply_schedule with one that only records its arguments
+    """
+    calls = []
+    scheduler._apply_schedule = lambda interval, start_time: calls.append((interval, start_time))
+    return calls
+
+
+class FakeSettingsService:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_measurement_config(self) -> MeasurementConfigSchema:
+        self.calls += 1
+        return MeasurementConfigSchema(
+            measurement_frequency=60,
+            first_measurement=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            length_of_ae=10,
+        )
+
+
+class TestCronScheduler:
+    async def test_reschedules_are_coalesced(self, scheduler: CronScheduler) -> None:
+        calls = _record_applies(scheduler)
+        start = datetime.now(timezone.utc) + timedelta(hours=1)
+
+        scheduler.set_new_schedule(30, start)
+        scheduler.set_new_schedule(45, start)
+
+        # The next run is reported right away, before the debounced apply
+        assert scheduler.next_scheduled_date == start
+        assert calls == []
+
+        await asyncio.sleep(RESCHEDULE_DEBOUNCE * 2)
+
+        assert calls == [(45, start)]
+        assert scheduler._pending is None
+
+    async def test_deferred_without_event_loop(self, scheduler: CronScheduler) -> None:
+        calls = _record_applies(scheduler)
+
+        await asyncio.to_thread(scheduler.set_new_schedule, 30)
+
+        assert calls == []
+        assert scheduler._pending is None
+        assert scheduler.next_scheduled_date is not None
+
+        scheduler.apply_pending_schedule()
+
+        assert len(calls) == 1
+        interval, start_time = calls[0]
+        assert interval == 30
+        assert start_time == scheduler.next_scheduled_date
+        assert start_time > datetime.now(timezone.utc)
+
+    async def test_past_start_time_moves_to_next_occurrence(self, scheduler: CronScheduler) -> None:
+        _record_applies(scheduler)
+        start = datetime.now(timezone.utc) - timedelta(minutes=25)
+
+        scheduler.set_new_schedule(10, start)
+
+        assert scheduler.next_scheduled_date == start + timedelta(minutes=30)
+
+    async def test_disabled_interval(self, scheduler: CronScheduler) -> None:
+        scheduler.set_new_schedule(0)
+
+        assert scheduler.next_scheduled_date is None
+
+        await asyncio.sleep(RESCHEDULE_DEBOUNCE * 2)
+
+        assert scheduler.next_scheduled_date is None
+        assert scheduler.task is None or scheduler.task.done()
+
+    async def test_same_config_id_is_not_rescheduled(self, scheduler: CronScheduler) -> None:
+        calls = _record_applies(scheduler)
+        scheduler.config_id = 7
+
+        scheduler.set_new_schedule(30, config_id=7)
+
+        assert scheduler._pending is None
+        await asyncio.sleep(RESCHEDULE_DEBOUNCE * 2)
+        assert calls == []
+
+    async def test_config_cache_and_bump_version(self, scheduler: CronScheduler) -> None:
+        settings_service = FakeSettingsService()
+        scheduler.settings_service = settings_service
+        scheduler._cached_config = None
+
+        first = await scheduler._get_config()
+        assert await scheduler._get_config() is first
+        assert settings_service.calls == 1
+
+        scheduler.bump_version()
+
+        await scheduler._get_config()
+        assert settings_service.calls == 2
@@ -0,0 +1,57 @@
+from app.services.google_drive_service import FolderIdCache, GoogleDriveService
+
+
+def _cache() -> FolderIdCache:
+    cache = FolderIdCache()
+    cache.put(None, "measurements", "root-id")
+    cache.put("root-id", "1", "one-id")
+    cache.put("one-id", "rgb", "rgb-id")
+    return cache
+
+
+class TestFolderIdCache:
+    def test_path_of(self) -> None:
+        cache = _cache()
+
+        assert cache.path_of("rgb-id") == ["measurements", "1", "rgb"]
+        assert cache.path_of("root-id") == ["measurements"]
+        assert cache.path_of("unknown-id") is None
+
+    def test_path_of_with_missing_level(self) -> None:
+        cache = _cache()
+        cache.put("gone-id", "orphan", "orphan-id")
+
+        assert cache.path_of("orphan-id") is None
+
+    def test_invalidate_drops_descendants(self) -> None:
+        cache = _cache()
+
+        cache.invalidate("one-id")
+
+        assert cache.get("root-id", "1") is None
+        assert cache.get("one-id", "rgb") is None
+        assert cache.get(None, "measurements") == "root-id"
+
+
+class TestGoogleDriveService:
+    def test_refresh_folder_resolves_path_again(self, monkeypatch) -> None:
+        service = GoogleDriveService.__new__(GoogleDriveService)
+        service._folder_cache = _cache()
+        resolved = []
+
+        def create_folder_path(path):
+            resolved.append(path)
+            return "new-rgb-id"
+
+        monkeypatch.setattr(service, "create_folder_path", create_folder_path)
+
+        assert service._refresh_folder("rgb-id") == "new-rgb-id"
+        assert resolved == ["measurements/1/rgb"]
+        assert service._folder_cache.get("one-id", "rgb") is None
+
+    def test_refresh_unknown_folder(self, monkeypatch) -> None:
+        service = GoogleDriveService.__new__(GoogleDriveService)
+        service._folder_cache = _cache()
+        monkeypatch.setattr(service, "create_folder_path", lambda path: "unexpected")
+
+        assert service._refresh_folder("unknown-id") is None
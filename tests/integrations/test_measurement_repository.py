@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta, timezone
+
+from app.models.measurement import MeasurementInfoOrm
+from app.models.measurement_file import MeasurementFileOrm
+from app.repository.measurement_file_repository import MeasurementFileRepository
+from app.repository.measurement_repository import MeasurementRepository
+
+BASE_TIME = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+async def _create_measurements(count: int, date_time: datetime = BASE_TIME) -> list:
+    """
+    Save count measurements, one minute apart starting at date_time
+    """
+    repo = MeasurementRepository()
+    return [
+        await repo.save_new_measurement(
+            MeasurementInfoOrm(
+                date_time=date_time + timedelta(minutes=i),
+                rgb_camera=True,
+                multispectral_camera=False,
+                number_of_sensors=1,
+                length_of_ae=1.0,
+                scheduled=False,
+            )
+        )
+        for i in range(count)
+    ]
+
+
+def _files(measurement_id: int, count: int) -> list:
+    return [
+        MeasurementFileOrm(
+            name=f"file_{i}.jpg",
+            google_drive_file_id=f"drive_{measurement_id}_{i}",
+            measurement_id=measurement_id,
+        )
+        for i in range(count)
+    ]
+
+
+class TestMeasurementRepository:
+    async def test_save_new_measurement_has_no_files(self) -> None:
+        (measurement,) = await _create_measurements(1)
+
+        assert measurement.id is not None
+        assert measurement.files == []
+
+    async def test_history_keyset_pagination(self) -> None:
+        repo = MeasurementRepository()
+        # Two rows share a timestamp, so the id has to break the tie
+        created = await _create_measurements(4) + await _create_measurements(1)
+        start, end = BASE_TIME, BASE_TIME + timedelta(hours=1)
+
+        pages = []
+        cursor = None
+        while True:
+            page = await repo.get_measurement_history(
+                start, end, limit=2, cursor=cursor, with_files=False
+            )
+            if not page:
+                break
+            pages.append([m.id for m in page])
+            cursor = (page[-1].date_time, page[-1].id)
+
+        expected = [
+            m.id
+            for m in sorted(created, key=lambda m: (m.date_time, m.id), reverse=True)
+        ]
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert [i for page in pages for i in page] == expected
+
+    async def test_history_with_files(self) -> None:
+        repo = MeasurementRepository()
+        (measurement,) = await _create_measurements(1)
+        await MeasurementFileRepository().save_many(_files(measurement.id, 3))
+
+        (loaded,) = await repo.get_measurement_history(
+            BASE_TIME, BASE_TIME + timedelta(minutes=1)
+        )
+        assert [f.name for f in loaded.files] == ["file_0.jpg", "file_1.jpg", "file_2.jpg"]
+
+        (loaded,) = await repo.get_measurement_history(
+            BASE_TIME, BASE_TIME + timedelta(minutes=1), with_files=False
+        )
+        assert loaded.files == []
+
+    async def test_get_by_id_with_files(self) -> None:
+        repo = MeasurementRepository()
+        (measurement,) = await _create_measurements(1)
+        await MeasurementFileRepository().save_many(_files(measurement.id, 2))
+
+        loaded = await repo.get_measurement_by_id(measurement.id)
+        assert len(loaded.files) == 2
+
+        loaded = await repo.get_measurement_by_id(measurement.id, with_files=False)
+        assert loaded.files == []
+
+    async def test_save_many(self) -> None:
+        (measurement,) = await _create_measurements(1)
+        files = _files(measurement.id, 3)
+
+        saved = await MeasurementFileRepository().save_many(files)
+
+        assert saved is files
+        assert all(f.id is not None and f.created_at is not None for f in saved)
+        assert [f.id for f in saved] == sorted(f.id for f in saved)
+        stored = await MeasurementFileRepository().get_by_measurement_id(measurement.id)
+        assert sorted((f.id, f.name) for f in stored) == [(f.id, f.name) for f in saved]
+
+    async def test_save_many_empty(self) -> None:
+        assert await MeasurementFileRepository().save_many([]) == []
@@ -0,0 +1,275 @@
+import asyncio
+import io
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models.measurement import MeasurementConfigSchema, MeasurementInfoOrm, MeasurementInfoSchema
+from app.repository.measurement_repository import MeasurementRepository
+from app.services import measurement_service
+from app.services.google_drive_service import GoogleDriveService
+from app.services.measurement_service import MeasurementService
+from app.services.measurement_service_test import MeasurementServiceTest
+
+COMPONENT_DELAY = 0.2
+
+
+def _config(**overrides) -> MeasurementConfigSchema:
+    values = dict(
+        measurement_frequency=60,
+        first_measurement=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        rgb_camera=True,
+        multispectral_camera=True,
+        number_of_sensors=2,
+        length_of_ae=1,
+    )
+    values.update(overrides)
+    return MeasurementConfigSchema(**values)
+
+
+def _service(calls: list, failing: str = None) -> MeasurementServiceTest:
+    """
+    A test measurement service whose Drive folder lookup and components are replaced
+    by ones that record how they were called
+    """
+    service = MeasurementServiceTest()
+
+    async def resolve_folder(measurement_id, folder_id=None):
+        calls.append(("folder", measurement_id))
+        return "folder-id", None
+
+    def component(name):
+        async def run(measurement_id, folder_id=None, now=None, timestamp=None, **kwargs):
+            calls.append((name, measurement_id, folder_id, now, timestamp))
+            await asyncio.sleep(COMPONENT_DELAY)
+            if name == failing:
+                raise RuntimeError(f"{name} failed")
+            return {"status": "success"}
+        return run
+
+    service._resolve_measurement_folder = resolve_folder
+    service.start_rgb_measurement = component("rgb")
+    service.start_multispectral_measurement = component("multispectral")
+    service.capture_acoustic_data = component("acoustic")
+    return service
+
+
+class TestMeasurementServiceTest:
+    async def test_components_run_concurrently(self) -> None:
+        calls = []
+        service = _service(calls)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        measurement = await service.start_measurement_by_config(_config())
+        elapsed = loop.time() - started
+
+        assert measurement is not None
+        assert elapsed < COMPONENT_DELAY * 2
+        # The folder is resolved once and every component shares it and the timestamps
+        assert calls[0] == ("folder", measurement.id)
+        components = calls[1:]
+        assert sorted(c[0] for c in components) == ["acoustic", "multispectral", "rgb"]
+        assert {c[1:] for c in components} == {
+            (
+                measurement.id,
+                "folder-id",
+                measurement.date_time,
+                measurement.date_time.strftime("%Y%m%d%H%M%S"),
+            )
+        }
+
+    async def test_only_configured_components_run(self) -> None:
+        calls = []
+        service = _service(calls)
+
+        await service.start_measurement_by_config(
+            _config(multispectral_camera=False, number_of_sensors=0)
+        )
+
+        assert [c[0] for c in calls] == ["folder", "rgb"]
+
+    async def test_no_enabled_component(self) -> None:
+        calls = []
+        service = _service(calls)
+
+        measurement = await service.start_measurement_by_config(
+            _config(rgb_camera=False, multispectral_camera=False, number_of_sensors=0)
+        )
+
+        assert measurement is None
+        assert calls == []
+
+    async def test_failed_component_keeps_measurement(self) -> None:
+        calls = []
+        service = _service(calls, failing="multispectral")
+
+        measurement = await service.start_measurement_by_config(_config())
+
+        assert measurement is not None
+        assert len(calls) == 4
+        stored = await MeasurementRepository().get_measurement_by_id(measurement.id)
+        assert stored is not None and stored.scheduled
+
+
+class FakeMeasurementRepository:
+    def __init__(self):
+        self.saved = []
+
+    async def save_new_measurement(self, measurement: MeasurementInfoOrm) -> MeasurementInfoSchema:
+        self.saved.append(measurement)
+        return MeasurementInfoSchema(
+            id=len(self.saved),
+            date_time=measurement.date_time,
+            rgb_camera=measurement.rgb_camera,
+            multispectral_camera=measurement.multispectral_camera,
+            number_of_sensors=measurement.number_of_sensors,
+            length_of_ae=measurement.length_of_ae,
+            scheduled=measurement.scheduled,
+        )
+
+
+class FakeFileRepository:
+    def __init__(self):
+        self.saved = []
+
+    async def save(self, file):
+        self.saved.append(file)
+        return file
+
+    async def save_many(self, files):
+        self.saved.extend(files)
+        return files
+
+
+class FakeDriveService:
+    async def ensure_authenticated_async(self) -> bool:
+        return True
+
+    async def create_folder_path_async(self, path: str) -> str:
+        return "folder-id"
+
+    async def upload_file_async(self, file_name, **kwargs) -> str:
+        return f"drive-{file_name}"
+
+    async def upload_files_to_path_async(self, files, **kwargs) -> list:
+        return [f"drive-{file['file_name']}" for file in files]
+
+
+class FakeCamera:
+    """
+    Stand-in for AravisCameraService; records every instance so tests can check it was released
+    """
+    instances = []
+
+    def __init__(self, camera_id: str, connected: bool = True, capture_error: Exception = None):
+        self.camera_id = camera_id
+        self.connected = connected
+        self.capture_error = capture_error
+        self.disconnected = False
+        FakeCamera.instances.append(self)
+
+    def connect(self) -> bool:
+        return self.connected
+
+    async def get_image_stream_async(self, format: str, compress_level: int) -> io.BytesIO:
+        if self.capture_error is not None:
+            raise self.capture_error
+        return io.BytesIO(b"image")
+
+    def disconnect(self) -> None:
+        self.disconnected = True
+
+
+@pytest.fixture
+def production_service(monkeypatch) -> MeasurementService:
+    """
+    A MeasurementService with fake repositories, Drive and cameras
+    """
+    FakeCamera.instances = []
+    monkeypatch.setattr(measurement_service, "AravisCameraService", FakeCamera)
+    monkeypatch.setattr(GoogleDriveService, "get_instance", classmethod(lambda cls: FakeDriveService()))
+    service = MeasurementService()
+    service.measurement_repo = FakeMeasurementRepository()
+    service.file_repo = FakeFileRepository()
+    return service
+
+
+def _fake_camera(monkeypatch, **kwargs) -> None:
+    monkeypatch.setattr(
+        measurement_service,
+        "AravisCameraService",
+        lambda camera_id: FakeCamera(camera_id, **kwargs),
+    )
+
+
+class TestMeasurementService:
+    async def test_no_enabled_component(self, production_service: MeasurementService) -> None:
+        measurement = await production_service.start_measurement_by_config(
+            _config(rgb_camera=False, multispectral_camera=False, number_of_sensors=0)
+        )
+
+        assert measurement is None
+        assert production_service.measurement_repo.saved == []
+
+    async def test_failed_component_keeps_measurement(
+        self, production_service: MeasurementService
+    ) -> None:
+        async def failing_rgb(**kwargs):
+            raise RuntimeError("rgb failed")
+
+        production_service.start_rgb_measurement = failing_rgb
+
+        measurement = await production_service.start_measurement_by_config(_config())
+
+        assert measurement is not None
+        assert measurement.id == 1
+        # The other components still ran and recorded their files under one timestamp
+        names = sorted(f.name for f in production_service.file_repo.saved)
+        timestamp = measurement_service._file_timestamp(measurement.date_time)
+        assert names == [
+            f"AE_sensor1_{timestamp}.txt",
+            f"AE_sensor2_{timestamp}.txt",
+            f"Multispectral_{timestamp}.png",
+        ]
+        assert {f.created_at for f in production_service.file_repo.saved} == {measurement.date_time}
+        assert all(camera.disconnected for camera in FakeCamera.instances)
+
+    async def test_camera_released_after_capture(
+        self, production_service: MeasurementService
+    ) -> None:
+        result = await production_service.start_rgb_measurement(
+            measurement_id=1, date_time=datetime.now(timezone.utc), duration=1
+        )
+
+        assert result["status"] == "success"
+        (camera,) = FakeCamera.instances
+        assert camera.disconnected
+
+    async def test_camera_released_when_connect_fails(
+        self, production_service: MeasurementService, monkeypatch
+    ) -> None:
+        _fake_camera(monkeypatch, connected=False)
+
+        result = await production_service.start_multispectral_measurement(
+            measurement_id=1, date_time=datetime.now(timezone.utc)
+        )
+
+        assert result["status"] == "error"
+        (camera,) = FakeCamera.instances
+        assert camera.disconnected
+        assert production_service.file_repo.saved == []
+
+    async def test_camera_released_when_capture_raises(
+        self, production_service: MeasurementService, monkeypatch
+    ) -> None:
+        _fake_camera(monkeypatch, capture_error=RuntimeError("no frame"))
+
+        result = await production_service.start_rgb_measurement(
+            measurement_id=1, date_time=datetime.now(timezone.utc), duration=1
+        )
+
+        assert result["status"] == "error"
+        assert "no frame" in result["message"]
+        (camera,) = FakeCamera.instances
+        assert camera.disconnected
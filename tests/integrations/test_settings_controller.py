@@ -0,0 +1,71 @@
+from typing import Generator
+
+import pytest
+from httpx import AsyncClient
+
+from app.middleware.auth import generate_access_token
+from app.models.user import UserOrm
+from app.repository import settings_repository
+from app.services.cron_scheduler import CronScheduler
+from app.services.settings_service import CONFIG_FIELDS
+
+CONFIG_URL = "/api/settings/measurement-config"
+
+
+@pytest.fixture(autouse=True)
+def clear_config_cache() -> Generator[None, None, None]:
+    """
+    Drop the process-wide config cache around each test; its rows are rolled back
+    """
+    settings_repository._CONFIG_CACHE = None
+    settings_repository._CONFIG_DICT = None
+    yield
+    settings_repository._CONFIG_CACHE = None
+    settings_repository._CONFIG_DICT = None
+
+
+@pytest.fixture
+def auth_headers() -> dict:
+    user = UserOrm(id=1, user_name="admin", is_admin=True)
+    return {"Authorization": f"Bearer {generate_access_token(user)}"}
+
+
+async def _current_config(async_client: AsyncClient, auth_headers: dict) -> dict:
+    response = await async_client.get(CONFIG_URL, headers=auth_headers)
+    assert response.status_code == 200
+    return {field: response.json()[field] for field in CONFIG_FIELDS}
+
+
+class TestSettingsController:
+    async def test_get_config(self, async_client: AsyncClient, auth_headers: dict) -> None:
+        config = await _current_config(async_client, auth_headers)
+
+        assert set(config) == set(CONFIG_FIELDS)
+
+    async def test_unchanged_config_is_a_no_op(
+        self, async_client: AsyncClient, auth_headers: dict, scheduler: CronScheduler
+    ) -> None:
+        config = await _current_config(async_client, auth_headers)
+        version = scheduler._config_version
+
+        response = await async_client.put(CONFIG_URL, json=config, headers=auth_headers)
+
+        assert response.status_code == 200
+        assert scheduler._config_version == version
+
+    async def test_changed_config_bumps_version(
+        self, async_client: AsyncClient, auth_headers: dict, scheduler: CronScheduler
+    ) -> None:
+        config = await _current_config(async_client, auth_headers)
+        version = scheduler._config_version
+        config["measurement_frequency"] += 30
+
+        response = await async_client.put(CONFIG_URL, json=config, headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json()["config"]["measurement_frequency"] == config["measurement_frequency"]
+        assert scheduler._config_version == version + 1
+        assert scheduler.next_scheduled_date is not None
+
+        # The cached config reflects the update right away
+        assert await _current_config(async_client, auth_headers) == config
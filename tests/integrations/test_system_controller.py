@@ -1,5 +1,9 @@
+from fastapi import FastAPI
 from httpx import AsyncClient
 
+from app.main import initialize
+from app.services.cron_scheduler import CronScheduler
+
 
 class TestSettingController:
     async def test_root(self, async_client: AsyncClient) -> None:
@@ -13,3 +17,21 @@ class TestSettingController:
 
         assert response.status_code == 200
         assert response.json() == {"fast-api-docker-poetry": 200}
+
+    async def test_liveness(self, async_client: AsyncClient) -> None:
+        response = await async_client.get("/api/health/live")
+
+        assert response.status_code == 200
+        assert response.json() == {"ok": True}
+
+    async def test_readiness_after_initialization(
+        self, app: FastAPI, async_client: AsyncClient, scheduler: CronScheduler
+    ) -> None:
+        await initialize(app)
+        try:
+            response = await async_client.get("/api/health/ready")
+        finally:
+            app.state.ready = False
+
+        assert response.status_code == 200
+        assert response.json() == {"ready": True}